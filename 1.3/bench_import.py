@@ -0,0 +1,63 @@
+"""启动导入耗时基准：python bench_import.py [--repeat N] [--budget 秒]
+
+每个模块在全新的解释器中导入 N 次取中位数；同时检查 main.py 启动时没有提前导入
+pandas / matplotlib / networkx 等重型依赖。main 导入超出预算或提前加载重型模块时返回非 0，
+可放在打包前或 CI 中防止启动变慢。
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+# 主窗口启动时不应加载的重型依赖
+HEAVY_MODULES = ("pandas", "numpy", "matplotlib", "networkx", "openpyxl", "scipy", "pyarrow")
+TARGETS = ("main", "package", "package.package_tool", "package.package_tool.pro_tool",
+           "package.gene_match_gui", "package.gene_tool_pro", "package.cv_link")
+
+_PROBE = """
+import sys, time
+t = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - t
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(elapsed, ",".join(heavy))
+"""
+
+def measure(module, repeat=5):
+    """返回 (导入耗时中位数, 导入后已加载的重型模块列表)"""
+    times, heavy = [], []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", _PROBE.format(module=module, heavy=HEAVY_MODULES)],
+                             cwd=HERE, capture_output=True, text=True, check=True).stdout.split()
+        times.append(float(out[0]))
+        heavy = out[1].split(",") if len(out) > 1 else []
+    return statistics.median(times), heavy
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="检查各模块导入耗时")
+    parser.add_argument("--repeat", type=int, default=5, help="每个模块导入次数（取中位数）")
+    parser.add_argument("--budget", type=float, default=0.3, help="main 导入耗时上限（秒）")
+    args = parser.parse_args(argv)
+
+    failed = False
+    for module in TARGETS:
+        try:
+            elapsed, heavy = measure(module, args.repeat)
+        except subprocess.CalledProcessError as e:
+            print(f"{module:<36} 导入失败：{e.stderr.strip().splitlines()[-1] if e.stderr else e}")
+            failed = True
+            continue
+        print(f"{module:<36} {elapsed * 1000:8.1f} ms  {'已加载: ' + ', '.join(heavy) if heavy else ''}")
+        if module == "main":
+            if heavy:
+                print(f"  ✗ main 启动时提前导入了重型模块: {', '.join(heavy)}")
+                failed = True
+            if elapsed > args.budget:
+                print(f"  ✗ main 导入耗时超出预算 {args.budget * 1000:.0f} ms")
+                failed = True
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,7 +2,7 @@ import tkinter as tk
 from tkinter import Menu, messagebox, Toplevel
 import os
 import sys
-import networkx as nx
+import multiprocessing
 
 # ========== 资源路径函数 ==========
 def resource_path(relative_path):
@@ -19,18 +19,8 @@ MENU_FG = "black"               # 菜单默认文字
 MENU_ACTIVE_FG = "red"          # 鼠标悬停文字
 MENU_ACTIVE_BG = "white"        # 鼠标悬停背景
 
-# ========== 主窗口 ==========
-root = tk.Tk()
-root.title("基因工具")
-root.geometry("500x350")
-
-# 设置主窗口图标
+# 主窗口图标
 icon_file = os.path.join(os.path.dirname(__file__), "package","image", "icon.ico")
-if os.path.exists(icon_file):
-    try:
-        root.iconbitmap(icon_file)
-    except Exception as e:
-        print(f"加载图标失败: {e}")
 
 # 添加：将窗口短时置顶的辅助函数（不使用 grab_set，避免主窗口被阻塞）
 def bring_to_front(win, duration=200):
@@ -44,9 +34,11 @@ def bring_to_front(win, duration=200):
     except Exception:
         pass
 
+# 各功能窗口的模块（pandas、matplotlib、networkx 等）在首次打开对应菜单时才导入，
+# 主窗口启动只需 tkinter；启动耗时可用 bench_import.py 检查
 # ===================== 文件转换 GUI =====================
-from package.File_conversion import FileConversionUI
 def open_file_conversion():
+    from package.File_conversion import FileConversionUI
     new_window = Toplevel(root)
     new_window.title("信息文件转换")
     new_window.geometry("500x200")
@@ -57,8 +49,8 @@ def open_file_conversion():
     # 将新窗口短时置顶（不会阻塞主窗口）
     bring_to_front(new_window)
 
-from package.id_gui import id_UI
 def open_id_gui():
+    from package.id_gui import id_UI
     new_window = Toplevel(root)
     new_window.title("ID文件转换")
     new_window.geometry("500x200")
@@ -69,8 +61,8 @@ def open_id_gui():
     bring_to_front(new_window)
 
 # ===================== 基因匹配 GUI =====================
-from package.gene_match_gui import GeneToolApp
 def open_gene_match():
+    from package.gene_match_gui import GeneToolApp
     new_window = Toplevel(root)
     new_window.title("基因匹配工具")
     if os.path.exists(icon_file):
@@ -79,8 +71,8 @@ def open_gene_match():
     app = GeneToolApp(new_window)
     bring_to_front(new_window)
 
-from package.gene_tool_pro import GeneProApp
 def gene_tool_pro():
+    from package.gene_tool_pro import GeneProApp
     new_window = Toplevel(root)
     new_window.title("基因匹配pro")
     if os.path.exists(icon_file):
@@ -90,8 +82,8 @@ def gene_tool_pro():
     bring_to_front(new_window)
 
 # ===================== 可视化 GUI =====================
-from package.cv_link import CV_LINK_GUI
 def open_cv_link():
+    from package.cv_link import CV_LINK_GUI
     new_window = Toplevel(root)
     new_window.title("基因关联可视化")
     if os.path.exists(icon_file):
@@ -101,8 +93,8 @@ def open_cv_link():
     bring_to_front(new_window)
 
 # ===================== 帮助页面 =====================
-from package.help import SyntenyGUI
 def open_help():
+    from package.help import SyntenyGUI
     new_window = Toplevel(root)
     new_window.title("帮助")
     if os.path.exists(icon_file):
@@ -111,41 +103,57 @@ def open_help():
     app = SyntenyGUI(new_window)
     bring_to_front(new_window)
 
-# ===================== 菜单栏 =====================
-menu_bar = Menu(root, bg=MENU_BG, fg=MENU_FG, activebackground=MENU_ACTIVE_BG, activeforeground=MENU_ACTIVE_FG)
-root.config(menu=menu_bar)
-
-# 文件预处理菜单
-file_menu = Menu(menu_bar, tearoff=0, bg=MENU_BG, fg=MENU_FG, activebackground=MENU_ACTIVE_BG, activeforeground=MENU_ACTIVE_FG)
-menu_bar.add_cascade(label="文件预处理", menu=file_menu)
-file_menu.add_command(label="ID文件转换", command=open_id_gui)
-file_menu.add_command(label="信息文件转换", command=open_file_conversion)
-
-# 工具菜单
-edit_menu = Menu(menu_bar, tearoff=0, bg=MENU_BG, fg=MENU_FG, activebackground=MENU_ACTIVE_BG, activeforeground=MENU_ACTIVE_FG)
-menu_bar.add_cascade(label="工具", menu=edit_menu)
-edit_menu.add_command(label="基因匹配", command=open_gene_match)
-edit_menu.add_command(label="基因匹配pro", command=gene_tool_pro)
-edit_menu.add_separator()
-# 可视化二级菜单
-visual_menu = Menu(edit_menu, tearoff=0, bg=MENU_BG, fg=MENU_FG, activebackground=MENU_ACTIVE_BG, activeforeground=MENU_ACTIVE_FG)
-edit_menu.add_cascade(label="可视化", menu=visual_menu)
-visual_menu.add_command(label="基因关联可视化", command=open_cv_link)
-visual_menu.add_command(label="其他可视化", command=lambda: messagebox.showinfo("其他可视化", "您居然注意到了这个功能！\n没错，这个功能还在开发。\n敬请期待！"))
-
-# 帮助菜单
-help_menu = Menu(menu_bar, tearoff=0, bg=MENU_BG, fg=MENU_FG, activebackground=MENU_ACTIVE_BG, activeforeground=MENU_ACTIVE_FG)
-menu_bar.add_cascade(label="帮助", command=open_help)
-
-# 关于菜单
-pertain_menu = Menu(menu_bar, tearoff=0, bg=MENU_BG, fg=MENU_FG, activebackground=MENU_ACTIVE_BG, activeforeground=MENU_ACTIVE_FG)
-menu_bar.add_cascade(label="关于",  command=lambda: messagebox.showinfo("关于", "gene_operations\nauthor：sea wears sky is color"))
-
-
-# ===================== 主界面提示 =====================
-label = tk.Label(root, text="欢迎使用基因工具！\n请通过菜单选择功能。", font=("微软雅黑", 14))
-label.pack(expand=True)
-
-# ===================== 启动主循环 =====================
-root.mainloop()
+# 多进程（spawn 方式）的子进程会以 __mp_main__ 重新导入本文件，窗口只在主进程中创建
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+
+    # ========== 主窗口 ==========
+    root = tk.Tk()
+    root.title("基因工具")
+    root.geometry("500x350")
+
+    # 设置主窗口图标
+    if os.path.exists(icon_file):
+        try:
+            root.iconbitmap(icon_file)
+        except Exception as e:
+            print(f"加载图标失败: {e}")
+
+    # ===================== 菜单栏 =====================
+    menu_bar = Menu(root, bg=MENU_BG, fg=MENU_FG, activebackground=MENU_ACTIVE_BG, activeforeground=MENU_ACTIVE_FG)
+    root.config(menu=menu_bar)
+
+    # 文件预处理菜单
+    file_menu = Menu(menu_bar, tearoff=0, bg=MENU_BG, fg=MENU_FG, activebackground=MENU_ACTIVE_BG, activeforeground=MENU_ACTIVE_FG)
+    menu_bar.add_cascade(label="文件预处理", menu=file_menu)
+    file_menu.add_command(label="ID文件转换", command=open_id_gui)
+    file_menu.add_command(label="信息文件转换", command=open_file_conversion)
+
+    # 工具菜单
+    edit_menu = Menu(menu_bar, tearoff=0, bg=MENU_BG, fg=MENU_FG, activebackground=MENU_ACTIVE_BG, activeforeground=MENU_ACTIVE_FG)
+    menu_bar.add_cascade(label="工具", menu=edit_menu)
+    edit_menu.add_command(label="基因匹配", command=open_gene_match)
+    edit_menu.add_command(label="基因匹配pro", command=gene_tool_pro)
+    edit_menu.add_separator()
+    # 可视化二级菜单
+    visual_menu = Menu(edit_menu, tearoff=0, bg=MENU_BG, fg=MENU_FG, activebackground=MENU_ACTIVE_BG, activeforeground=MENU_ACTIVE_FG)
+    edit_menu.add_cascade(label="可视化", menu=visual_menu)
+    visual_menu.add_command(label="基因关联可视化", command=open_cv_link)
+    visual_menu.add_command(label="其他可视化", command=lambda: messagebox.showinfo("其他可视化", "您居然注意到了这个功能！\n没错，这个功能还在开发。\n敬请期待！"))
+
+    # 帮助菜单
+    help_menu = Menu(menu_bar, tearoff=0, bg=MENU_BG, fg=MENU_FG, activebackground=MENU_ACTIVE_BG, activeforeground=MENU_ACTIVE_FG)
+    menu_bar.add_cascade(label="帮助", command=open_help)
+
+    # 关于菜单
+    pertain_menu = Menu(menu_bar, tearoff=0, bg=MENU_BG, fg=MENU_FG, activebackground=MENU_ACTIVE_BG, activeforeground=MENU_ACTIVE_FG)
+    menu_bar.add_cascade(label="关于",  command=lambda: messagebox.showinfo("关于", "gene_operations\nauthor：sea wears sky is color"))
+
+
+    # ===================== 主界面提示 =====================
+    label = tk.Label(root, text="欢迎使用基因工具！\n请通过菜单选择功能。", font=("微软雅黑", 14))
+    label.pack(expand=True)
+
+    # ===================== 启动主循环 =====================
+    root.mainloop()
 
@@ -6,51 +6,174 @@ import os
 from datetime import datetime
 from tkinter import ttk
 import threading  # ✅ 新增
+from package.package_tool.io_tool import GCOL_EXT, STR_DTYPE, TableStreamWriter, write_table
 
 # ========== 数据解析函数 ==========
-def parse_collinearity(file_path, output_folder, self=None):
-    """解析 .collinearity 文件并导出 Excel"""
+COLLINEARITY_COLUMNS = ["Block", "GeneA", "GeneB", "E-value"]
+# 每次读取约 32MB 文本再解析，内存只保留一块
+CHUNK_BYTES = 32 * 1024 * 1024
+# .collinearity 可输出的格式；csv / tsv / parquet 逐块追加写出，不受 Excel 行数限制；
+# gcol 为基因字典编码的二进制存储（见 package_tool.gcol_tool），各工具可直接内存映射读取
+COLLINEARITY_FORMATS = ("xlsx", "csv", "tsv", "parquet", "gcol")
+
+_PAIR_RE = re.compile(r"^(?P<block>\d+-\s*\d+:)\s+(?P<a>\S+)\s+(?P<b>\S+)\s+(?P<e>\S+)$")
+_ALIGN_RE = re.compile(r"Alignment\s+(?P<block>\d+)")
+
+def _parse_lines(lines, block_id):
+    """逐行解析一块文本，返回 (行数据列表, 块末尾的当前 block_id)"""
     data = []
-    block_id = "Unassigned"
-    if self:
-        self.update_status("正在运行...")
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
 
-    with open(file_path, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
+        if line.startswith("## Alignment"):
+            match = _ALIGN_RE.search(line)
+            block_id = match.group(1) if match else block_id
+            continue
 
-            if line.startswith("## Alignment"):
-                match = re.search(r"Alignment\s+(\d+)", line)
-                block_id = match.group(1) if match else block_id
-                continue
+        if line.startswith("#"):
+            continue
 
-            if line.startswith("#"):
-                continue
+        m = _PAIR_RE.match(line)
+        if m:
+            block_idx, geneA, geneB, evalue = m.groups()
+            data.append([block_idx, geneA, geneB, evalue])
+            continue
 
-            m = re.match(r"^(\d+-\s*\d+:)\s+(\S+)\s+(\S+)\s+(\S+)$", line)
-            if m:
-                block_idx, geneA, geneB, evalue = m.groups()
-                data.append([block_idx, geneA, geneB, evalue])
-                continue
+        parts = line.split()
+        if len(parts) == 3:
+            geneA, geneB, evalue = parts
+            data.append([block_id, geneA, geneB, evalue])
+        elif len(parts) == 2:
+            geneA, evalue = parts
+            data.append([block_id, geneA, "NA", evalue])
+    return data, block_id
 
-            parts = line.split()
-            if len(parts) == 3:
-                geneA, geneB, evalue = parts
-                data.append([block_id, geneA, geneB, evalue])
-            elif len(parts) == 2:
-                geneA, evalue = parts
-                data.append([block_id, geneA, "NA", evalue])
+def _str_extract(s, pattern):
+    """按命名分组提取，返回以分组名为列的 DataFrame（未匹配行为缺失值）
 
-    df = pd.DataFrame(data, columns=["Block", "GeneA", "GeneB", "E-value"])
+    字符串列为 Arrow 存储时直接调用 pyarrow 的 RE2 正则，比 pandas 的 str.extract 快一个数量级。
+    """
+    if STR_DTYPE == str:
+        return s.str.extract(pattern)
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    arr = pa.array(s.array)
+    arr = arr.combine_chunks() if isinstance(arr, pa.ChunkedArray) else arr
+    res = pc.extract_regex(arr, pattern)
+    # 未匹配的行整个 struct 为空，但其字段值是空串，需按 struct 有效位置空
+    valid = res.is_valid()
+    return pd.DataFrame({f.name: pd.Series(pd.arrays.ArrowStringArray(pc.if_else(valid, res.field(i), None)),
+                                           index=s.index)
+                         for i, f in enumerate(res.type)})
+
+def _parse_lines_vectorized(lines, block_id):
+    """_parse_lines 的向量化版本：整块文本用字符串列运算一次解析，结果与逐行解析一致
+
+    "## Alignment N" 行给出 Block 编号，向下填充到其后的基因对行；其余 # 开头的行与空行跳过；
+    符合 "N-  M: A B E" 的行保留前缀作为 Block，否则按空白切分为 3 段或 2 段（GeneB 记为 "NA"）。
+    """
+    s = pd.Series(lines, dtype=STR_DTYPE).str.strip()
+    s = s[s.str.len() > 0]
+    is_comment = s.str.startswith("#")
+    is_align = s.str.startswith("## Alignment")
+    # 未匹配到编号的 Alignment 行与块开头沿用前一个编号
+    blocks = _str_extract(s[is_align], _ALIGN_RE.pattern)["block"].reindex(s.index).ffill().fillna(block_id)
+    next_block_id = blocks.iloc[-1] if len(blocks) else block_id
+
+    body, body_block = s[~is_comment], blocks[~is_comment]
+    m = _str_extract(body, _PAIR_RE.pattern)
+    matched = m["block"].notna()
+    parts = []
+    if matched.any():
+        mm = m[matched]
+        parts.append(pd.DataFrame({"Block": mm["block"], "GeneA": mm["a"], "GeneB": mm["b"], "E-value": mm["e"]}))
+    rest = body[~matched]
+    if len(rest):
+        tokens = rest.astype(object).str.split()
+        n = tokens.str.len()
+        three, two = tokens[n == 3], tokens[n == 2]
+        parts.append(pd.DataFrame({"Block": body_block[three.index], "GeneA": three.str[0],
+                                   "GeneB": three.str[1], "E-value": three.str[2]}, dtype=STR_DTYPE))
+        parts.append(pd.DataFrame({"Block": body_block[two.index], "GeneA": two.str[0],
+                                   "GeneB": "NA", "E-value": two.str[1]}, index=two.index, dtype=STR_DTYPE))
+    if not parts:
+        return pd.DataFrame(columns=COLLINEARITY_COLUMNS, dtype=STR_DTYPE), next_block_id
+    df = pd.concat(parts) if len(parts) > 1 else parts[0]
+    if len(parts) > 1:
+        # 基因对行与其他行分开解析，按原行号恢复文件中的顺序
+        df = df.sort_index(kind="stable")
+    return df.reset_index(drop=True), next_block_id
+
+def _to_float(s):
+    """字符串列转为 float64，无法解析的值为 NaN；Arrow 字符串列优先用 pyarrow 直接转换"""
+    if STR_DTYPE != str:
+        import pyarrow as pa
+        try:
+            arr = pa.array(s.array).cast(pa.float64())
+            return pd.Series(arr.to_numpy(zero_copy_only=False), index=s.index)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            pass
+    return pd.to_numeric(s, errors="coerce").astype("float64")
+
+def _typed_frame(df):
+    """Block 转为 int32（取 "N-  M:" 前缀或 Alignment 编号中的 N，Unassigned 为 -1），E-value 转为 float64"""
+    block = _str_extract(df["Block"].astype(STR_DTYPE), r"^(?P<n>\d+)")["n"]
+    df["Block"] = _to_float(block).fillna(-1).astype("int32")
+    df["E-value"] = _to_float(df["E-value"])
+    return df
+
+def iter_collinearity_chunks(file_path, typed=False, chunk_bytes=CHUNK_BYTES, vectorized=True):
+    """按约 chunk_bytes 大小的文本块流式解析 .collinearity 文件，逐块产出 DataFrame
+
+    块之间延续当前 Alignment 编号；typed=True 时 Block 为 int32、E-value 为 float64，否则均为字符串。
+    vectorized=False 时退回逐行正则解析。
+    """
+    block_id = "Unassigned"
+    with open(file_path, "r", encoding="utf-8", buffering=1 << 20) as f:
+        while True:
+            lines = f.readlines(chunk_bytes)
+            if not lines:
+                break
+            if vectorized:
+                df, block_id = _parse_lines_vectorized(lines, block_id)
+            else:
+                data, block_id = _parse_lines(lines, block_id)
+                df = pd.DataFrame(data, columns=COLLINEARITY_COLUMNS)
+            yield _typed_frame(df) if typed else df
+
+def parse_collinearity(file_path, output_folder, self=None, output_format="xlsx", typed=False):
+    """解析 .collinearity 文件并导出（默认 Excel），返回输出文件路径
+
+    output_format 为 csv / tsv / parquet 时逐块追加写出，内存只保留一块，适合数百万行的完整结果；
+    typed=True 时 Block 输出为整数、E-value 输出为浮点数；gcol 格式总是按数值列存储。
+    """
+    if output_format not in COLLINEARITY_FORMATS:
+        raise ValueError(f"不支持的输出格式: {output_format}（可选: {', '.join(COLLINEARITY_FORMATS)}）")
+    if self:
+        self.update_status("正在运行...")
 
     base_name = os.path.splitext(os.path.basename(file_path))[0]
     ext = os.path.splitext(file_path)[1].replace(".", "")
     timestamp = datetime.now().strftime("%Y%m%d_%H%M")
     output_file = os.path.join(output_folder, f"{base_name}_{ext}_{timestamp}.xlsx")
-    df.to_excel(output_file, index=False)
-    return output_file
+    if output_format == "gcol":
+        from package.package_tool.gcol_tool import GcolWriter
+        writer, typed = GcolWriter(os.path.splitext(output_file)[0] + GCOL_EXT), True
+    else:
+        writer = TableStreamWriter(output_file, output_format)
+    try:
+        for df in iter_collinearity_chunks(file_path, typed=typed):
+            writer.write(df)
+            if self:
+                self.update_status(f"正在运行... 已解析 {writer.rows} 行")
+    finally:
+        writer.close()
+    if not writer.rows and output_format != "gcol":
+        # 没有解析到任何行时仍输出只含表头的文件
+        return write_table(pd.DataFrame(columns=COLLINEARITY_COLUMNS), output_file, output_format)
+    return writer.path
 
 
 # ========== GUI ==========
@@ -58,7 +181,7 @@ class FileConversionUI:
     def __init__(self, master):
         self.master = master
         master.title("信息文件转换")
-        master.geometry("500x250")
+        master.geometry("500x290")
         master.resizable(False, False)
 
         # ========== 输入文件 ==========
@@ -83,6 +206,17 @@ class FileConversionUI:
 
         frame_output.columnconfigure(1, weight=1)
 
+        # ========== 输出选项 ==========
+        frame_option = ttk.Frame(master)
+        frame_option.pack(fill="x", padx=10, pady=5)
+        ttk.Label(frame_option, text="输出格式:").grid(row=0, column=0, padx=5, sticky="w")
+        self.cmb_format = ttk.Combobox(frame_option, values=list(COLLINEARITY_FORMATS), width=8, state="readonly")
+        self.cmb_format.set("xlsx")
+        self.cmb_format.grid(row=0, column=1, padx=5, sticky="w")
+        self.typed = tk.BooleanVar(value=False)
+        ttk.Checkbutton(frame_option, text="数值列（Block 整数、E-value 浮点）",
+                        variable=self.typed).grid(row=0, column=2, padx=5, sticky="w")
+
         # ========== 转换按钮 ==========
         frame_button = ttk.Frame(master)
         frame_button.pack(pady=15)
@@ -127,7 +261,9 @@ class FileConversionUI:
             self.update_status("错误,请选择有效的输出目录")
             return
         try:
-            output_file = parse_collinearity(file_path, output_folder, self)
+            output_file = parse_collinearity(file_path, output_folder, self,
+                                             output_format=self.cmb_format.get() or "xlsx",
+                                             typed=self.typed.get())
             # 弹窗必须在主线程调用
             self.update_status(f"转换完成 输出文件:\n{output_file}")
         except Exception as e:
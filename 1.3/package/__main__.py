@@ -0,0 +1,266 @@
+"""命令行入口：python -m package <子命令> ...
+
+无需图形界面即可在服务器上运行各项功能，例如：
+    python -m package pro a.xlsx b.xlsx out/ --a-col 基因名 --b1 GeneID --b2 描述 --format parquet
+    python -m package match a.xlsx b.csv result.xlsx --a-col id --b-id GeneA --b-col GeneB --vertical
+    python -m package plot network links.csv net.png --x GeneA --y GeneB
+    python -m package job jobs.yaml
+
+job 子命令读取 JSON/YAML 任务文件，在同一进程中依次执行多个任务，相同的 B 表及其索引只加载一次：
+    defaults:            # 可选，合并到每个任务中
+      b: b.xlsx
+    jobs:
+      - command: pro
+        a: a1.xlsx
+        output: out/
+        a_col: 基因名
+        b1: GeneID
+        b2: 描述
+      - command: match
+        a: a2.xlsx
+        output: match.xlsx
+        a_col: id
+        b_id: GeneA
+        b_col: GeneB
+任务中的键名与对应子命令的参数名一致（选项去掉前缀 -- 并把 - 换成 _）。
+"""
+import argparse
+import json
+import os
+import sys
+
+from .package_tool import cache_tool
+
+PLOT_KINDS = ("network", "heatmap", "chord")
+
+def _status(quiet):
+    if quiet:
+        return None
+    return lambda text: print(text, file=sys.stderr, flush=True)
+
+def _pick(opts, names):
+    """只取出任务中实际给出的可选参数，其余沿用被调用函数自身的默认值"""
+    return {k: opts[k] for k in names if k in opts}
+
+def _require(opts, command, names):
+    missing = [k for k in names if opts.get(k) in (None, "")]
+    if missing:
+        raise ValueError(f"{command} 缺少参数: {', '.join(missing)}")
+
+def _require_file(path):
+    """输入文件不存在时报错，避免先创建输出目录再在解析时失败"""
+    if not os.path.isfile(path):
+        raise ValueError(f"输入文件不存在: {path}")
+
+def run_collinearity(opts):
+    from .File_conversion import parse_collinearity
+    _require(opts, "collinearity", ["input", "output"])
+    _require_file(opts["input"])
+    os.makedirs(opts["output"], exist_ok=True)
+    return parse_collinearity(opts["input"], opts["output"], **_pick(opts, ["output_format", "typed"]))
+
+def run_id(opts):
+    from .id_gui import parse_collinearity
+    _require(opts, "id", ["input", "output"])
+    _require_file(opts["input"])
+    os.makedirs(opts["output"], exist_ok=True)
+    return parse_collinearity(opts["input"], opts["output"])
+
+def run_query(opts):
+    from .package_tool import gene_operations as go
+    _require(opts, "query", ["a", "b", "output", "a_col", "b_id", "b_col"])
+    return go.gene_correspondence_with_progress(
+        opts["a"], opts["b"], opts["output"], opts["a_col"], opts["b_id"], opts["b_col"],
+        set_progress_status=_status(opts.get("quiet")),
+        **_pick(opts, ["compact", "output_format", "use_cache"]))
+
+def run_match(opts):
+    from .package_tool import gene_operations as go
+    _require(opts, "match", ["a", "b", "output", "a_col", "b_id", "b_col"])
+    return go.fuzzy_match_with_progress(
+        opts["a"], opts["b"], opts["output"], opts["a_col"], opts["b_id"], opts["b_col"],
+        set_progress_status=_status(opts.get("quiet")),
+        **_pick(opts, ["vertical", "compact", "output_format", "use_cache", "checkpoint", "resume"]))
+
+def run_pro(opts):
+    from .package_tool import pro_tool
+    _require(opts, "pro", ["a", "b", "output", "a_col", "b1", "b2"])
+    return pro_tool.pro_match(
+        opts["a"], opts["b"], opts["output"], opts["a_col"], opts["b1"], opts["b2"],
+        status_cb=_status(opts.get("quiet")),
+        **_pick(opts, ["export_other", "threshold_ratio", "output_format", "use_cache", "workers",
+                       "match_mode", "top_n", "stream", "chunk_size", "checkpoint", "resume"]))
+
+def run_plot(opts):
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from .package_tool import cv_tool
+    from .package_tool.io_tool import read_table
+    _require(opts, "plot", ["kind", "input", "output"])
+    kind = opts["kind"]
+    if kind not in PLOT_KINDS:
+        raise ValueError(f"不支持的图形类型: {kind}（可选: {', '.join(PLOT_KINDS)}）")
+    df = read_table(opts["input"])
+    x, y, w = opts.get("x"), opts.get("y"), opts.get("weight")
+    if kind == "network":
+        fig = cv_tool.plot_network(df, x, y, w, **_pick(opts, ["layout", "use_cache"]))
+    elif kind == "heatmap":
+        fig = cv_tool.plot_heatmap(df, x, y, w)
+    else:
+        fig = cv_tool.plot_chord(df, x, y)
+    if fig is None:
+        raise ValueError("绘图失败：请检查列名与数据内容。")
+    fig.savefig(opts["output"], dpi=opts.get("dpi", 150))
+    plt.close(fig)
+    return opts["output"]
+
+RUNNERS = {
+    "collinearity": run_collinearity,
+    "id": run_id,
+    "query": run_query,
+    "match": run_match,
+    "pro": run_pro,
+    "plot": run_plot,
+}
+
+def load_jobs(path):
+    """读取任务文件（.json 或 .yaml/.yml），返回合并了 defaults 的任务列表"""
+    with open(path, encoding="utf-8") as f:
+        if os.path.splitext(path)[1].lower() in (".yaml", ".yml"):
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError("读取 YAML 任务文件需要安装 pyyaml：pip install pyyaml")
+            spec = yaml.safe_load(f)
+        else:
+            spec = json.load(f)
+    if isinstance(spec, list):
+        spec = {"jobs": spec}
+    defaults = spec.get("defaults") or {}
+    jobs = []
+    for i, job in enumerate(spec.get("jobs") or []):
+        job = {**defaults, **job}
+        if job.get("command") not in RUNNERS:
+            raise ValueError(f"第 {i + 1} 个任务的 command 无效: {job.get('command')}（可选: {', '.join(RUNNERS)}）")
+        jobs.append(job)
+    return jobs
+
+def run_jobs(path, quiet=False, keep_going=False):
+    """在同一进程中依次执行任务文件中的任务，启用进程内缓存复用 B 表与索引；返回失败任务数"""
+    jobs = load_jobs(path)
+    failed = 0
+    cache_tool.enable_memory_cache()
+    try:
+        for i, job in enumerate(jobs, start=1):
+            job.setdefault("quiet", quiet)
+            label = f"[{i}/{len(jobs)}] {job['command']}"
+            if not quiet:
+                print(f"{label} 开始", file=sys.stderr, flush=True)
+            try:
+                result = RUNNERS[job["command"]](job)
+                print(result if result is not None else f"{label} 没有生成任何结果", flush=True)
+            except Exception as e:
+                failed += 1
+                print(f"{label} 失败：{e}", file=sys.stderr, flush=True)
+                if not keep_going:
+                    break
+    finally:
+        cache_tool.disable_memory_cache()
+    return failed
+
+def _add_output_options(p):
+    p.add_argument("--format", dest="output_format", choices=["xlsx", "parquet", "feather", "tsv", "csv"],
+                   help="输出格式（默认 xlsx）")
+    p.add_argument("--cache", dest="use_cache", action="store_true", help="使用本地缓存的 B 表与索引")
+
+def _add_gene_options(p):
+    p.add_argument("a", help="A 表（基因列表）")
+    p.add_argument("b", help="B 表（对应关系）")
+    p.add_argument("output", help="输出文件")
+    p.add_argument("--a-col", dest="a_col", required=True, help="A 表基因列")
+    p.add_argument("--b-id", dest="b_id", required=True, help="B 表基因 ID 列")
+    p.add_argument("--b-col", dest="b_col", required=True, help="B 表共线性基因列")
+    p.add_argument("--compact", action="store_true", help="使用紧凑图结构（全基因组规模 B 表）")
+    _add_output_options(p)
+
+def build_parser():
+    # 未给出的可选参数不写入结果，由各函数自身的默认值决定
+    parser = argparse.ArgumentParser(prog="python -m package", description="基因表格处理工具（命令行）",
+                                     argument_default=argparse.SUPPRESS)
+    parser.add_argument("-q", "--quiet", action="store_true", help="不输出进度信息")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("collinearity", help="解析 .collinearity 文件为表格", argument_default=argparse.SUPPRESS)
+    p.add_argument("input")
+    p.add_argument("output", help="输出目录")
+    p.add_argument("--format", dest="output_format", choices=["xlsx", "csv", "tsv", "parquet", "gcol"],
+                   help="输出格式（默认 xlsx；csv/tsv/parquet 流式写出，适合数百万行；gcol 为可内存映射的二进制存储）")
+    p.add_argument("--typed", action="store_true", help="Block 输出为整数、E-value 输出为浮点数")
+
+    p = sub.add_parser("id", help="从文本或表格中提取 ID 列", argument_default=argparse.SUPPRESS)
+    p.add_argument("input")
+    p.add_argument("output", help="输出目录")
+
+    p = sub.add_parser("query", help="基因查询（精确对应）", argument_default=argparse.SUPPRESS)
+    _add_gene_options(p)
+
+    p = sub.add_parser("match", help="基因匹配（精确 + 模糊递归检索）", argument_default=argparse.SUPPRESS)
+    _add_gene_options(p)
+    p.add_argument("--vertical", action="store_true", help="竖向输出")
+    p.add_argument("--checkpoint", action="store_true", help="定期保存检查点")
+    p.add_argument("--resume", action="store_true", help="从检查点继续")
+
+    p = sub.add_parser("pro", help="专业匹配（B1/B2 双列精确 + 模糊匹配）", argument_default=argparse.SUPPRESS)
+    p.add_argument("a", help="A 表")
+    p.add_argument("b", help="B 表")
+    p.add_argument("output", help="输出目录")
+    p.add_argument("--a-col", dest="a_col", required=True)
+    p.add_argument("--b1", required=True)
+    p.add_argument("--b2", required=True)
+    p.add_argument("--ratio", dest="threshold_ratio", type=float, help="模糊匹配阈值（默认 0.6）")
+    p.add_argument("--no-other", dest="export_other", action="store_false", help="不导出 B 表其他列")
+    p.add_argument("--mode", dest="match_mode", choices=["token", "ranked", "ngram"], help="模糊匹配模式")
+    p.add_argument("--top-n", dest="top_n", type=int, help="ranked/ngram 模式每行保留的候选数")
+    p.add_argument("--workers", type=int, help="并行进程数")
+    p.add_argument("--stream", action="store_true", help="分块流式写出")
+    p.add_argument("--chunk-size", dest="chunk_size", type=int, help="分块行数")
+    p.add_argument("--checkpoint", action="store_true", help="定期保存检查点")
+    p.add_argument("--resume", action="store_true", help="从检查点继续")
+    _add_output_options(p)
+
+    p = sub.add_parser("plot", help="绘制网络图 / 热图 / 弦图并保存为图片", argument_default=argparse.SUPPRESS)
+    p.add_argument("kind", choices=PLOT_KINDS)
+    p.add_argument("input", help="数据表")
+    p.add_argument("output", help="图片文件（.png / .pdf / .svg）")
+    p.add_argument("--x", help="第一列（节点1 / X）")
+    p.add_argument("--y", help="第二列（节点2 / Y）")
+    p.add_argument("--weight", help="权重列（网络图）或数值列（热图）")
+    p.add_argument("--dpi", type=int)
+    p.add_argument("--layout", choices=["auto", "spring", "fast", "spectral"],
+                   help="网络图布局引擎（默认 auto：大图按连通分量使用近似布局）")
+    p.add_argument("--cache", dest="use_cache", action="store_true", help="把网络图布局缓存到本地，相同边集合再次绘图时复用")
+
+    p = sub.add_parser("job", help="批量执行 JSON/YAML 任务文件", argument_default=argparse.SUPPRESS)
+    p.add_argument("file")
+    p.add_argument("--keep-going", dest="keep_going", action="store_true", help="任务失败时继续执行后续任务")
+    return parser
+
+def main(argv=None):
+    opts = vars(build_parser().parse_args(argv))
+    command = opts.pop("command")
+    if command == "job":
+        return 1 if run_jobs(opts["file"], opts.get("quiet", False), opts.get("keep_going", False)) else 0
+    try:
+        result = RUNNERS[command](opts)
+    except Exception as e:
+        print(f"错误：{e}", file=sys.stderr)
+        return 1
+    if result is None:
+        print("没有生成任何结果。", file=sys.stderr)
+        return 1
+    print(result)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,11 @@
 import tkinter as tk
 from tkinter import filedialog, ttk
 import os
-import pandas as pd
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import threading
 from package.package_tool.cv_tool import plot_chord, plot_heatmap, plot_network
+from package.package_tool.io_tool import read_table
 
 
 class CV_LINK_GUI:
@@ -80,16 +80,16 @@ class CV_LINK_GUI:
         status_label.grid(row=3, column=0, columnspan=4, sticky="we")
 
     def load_file(self, path_var):
-        file_path = filedialog.askopenfilename(filetypes=[("Excel/CSV files", "*.xlsx;*.xls;*.csv")])
+        file_path = filedialog.askopenfilename(filetypes=[("Excel/CSV files", "*.xlsx;*.xls;*.csv"),
+                                                          ("表格文件", "*.tsv;*.parquet;*.feather"),
+                                                          ("共线性二进制存储", "*.gcol")])
         if not file_path:
             return
 
         self.path_var.set(file_path)
         try:
-            if file_path.endswith(".csv"):
-                self.df = pd.read_csv(file_path)
-            else:
-                self.df = pd.read_excel(file_path)
+            # .gcol 等二进制格式内存映射读取，无需再次解析原始表格
+            self.df = read_table(file_path)
 
             cols = list(self.df.columns)
             cols_with_blank = ["--- 请选择 ---"] + cols
@@ -2,7 +2,6 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import threading
 import os
-import pandas as pd
 import platform
 import subprocess
 from datetime import datetime
@@ -27,6 +26,8 @@ class GeneToolApp:
         self.selected_function = None
         self.selected_match_mode = None
         self.fuzzy_var = tk.BooleanVar(value=False)
+        self.output_format = tk.StringVar(value="xlsx")
+        self.use_cache = tk.BooleanVar(value=True)
 
         # ---------------- GUI ----------------
         self.build_gui()
@@ -53,6 +54,12 @@ class GeneToolApp:
         self.match_mode_combo.grid_remove()
         self.fuzzy_check.grid_remove()
 
+        ttk.Label(frame_function, text="输出格式:").grid(row=1, column=0, padx=5, pady=5, sticky="w")
+        ttk.Combobox(frame_function, textvariable=self.output_format, values=list(go.io_tool.OUTPUT_FORMATS),
+                     state="readonly", width=20).grid(row=1, column=1, padx=5, pady=5, sticky="w")
+        ttk.Checkbutton(frame_function, text="缓存信息表（加速重复运行）",
+                        variable=self.use_cache).grid(row=1, column=2, columnspan=2, padx=5, pady=5, sticky="w")
+
         self.function_combo.bind("<<ComboboxSelected>>", self.on_function_select)
         self.match_mode_combo.bind("<<ComboboxSelected>>", self.on_match_mode_select)
 
@@ -114,7 +121,8 @@ class GeneToolApp:
 
     # ---------------- 文件操作 ----------------
     def load_file(self, var, target):
-        path = filedialog.askopenfilename(filetypes=[("Excel 文件", "*.xlsx")])
+        path = filedialog.askopenfilename(filetypes=[("表格文件", "*.xlsx *.xls *.csv *.tsv *.txt *.gz *.parquet *.feather *.gcol"),
+                                                     ("Excel 文件", "*.xlsx"), ("所有文件", "*.*")])
         if path:
             var.set(path)
             self.update_columns(path, target)
@@ -126,8 +134,7 @@ class GeneToolApp:
 
     def update_columns(self, filepath, target):
         try:
-            df = pd.read_excel(filepath, nrows=0)
-            cols = list(df.columns)
+            cols = go.io_tool.read_columns(filepath)
             if target == "a":
                 # 自动优先选择GeneA
                 if "GeneA" in cols:
@@ -190,17 +197,19 @@ class GeneToolApp:
                 self.update_main_progress(0)
                 self.update_sub_progress(0)
                 self.update_status("正在运行...")
-                func(args[0], args[1], output_file, args[2], args[3], args[4],
-                     progress_callback=self.update_main_progress,
-                     sub_progress_callback=self.update_sub_progress,
-                     set_progress_status=self.update_status,
-                     **extra_kwargs)
+                saved_file = func(args[0], args[1], output_file, args[2], args[3], args[4],
+                                  progress_callback=self.update_main_progress,
+                                  sub_progress_callback=self.update_sub_progress,
+                                  set_progress_status=self.update_status,
+                                  output_format=self.output_format.get(),
+                                  use_cache=self.use_cache.get(),
+                                  **extra_kwargs) or output_file
                 self.update_main_progress(100)
                 self.update_sub_progress(100)
                 self.update_status("操作完成")
-                open_choice = messagebox.askyesno("成功", f"操作完成，结果已保存到：\n{output_file}\n是否现在打开？")
+                open_choice = messagebox.askyesno("成功", f"操作完成，结果已保存到：\n{saved_file}\n是否现在打开？")
                 if open_choice:
-                    self.open_with_default(output_file)
+                    self.open_with_default(saved_file)
             except Exception as e:
                 self.update_status("运行出错")
                 messagebox.showerror("错误", f"运行时出现错误：{e}")
@@ -4,8 +4,6 @@ from datetime import datetime
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import pandas as pd
-import re
-from collections import defaultdict
 # 新增：调用外部匹配模块
 from package.package_tool import pro_tool
 
@@ -14,7 +12,7 @@ class GeneProApp:
     def __init__(self, root):
         self.root = root
         self.root.title("基因匹配pro")
-        self.root.geometry("720x560")
+        self.root.geometry("720x640")
 
         self.worker_thread = None
         self.stop_flag = False
@@ -65,9 +63,49 @@ class GeneProApp:
                                                 variable=self.export_other)
         # 保持原位稍往下
         self.chk_export_other.grid(column=2, row=0, padx=5, pady=5, sticky='w')
+
+        # 输出格式：xlsx / parquet / feather / tsv
+        ttk.Label(frame_columns, text="输出格式：").grid(column=0, row=1, padx=5, pady=5, sticky='e')
+        self.cmb_format = ttk.Combobox(frame_columns, values=list(pro_tool.OUTPUT_FORMATS),
+                                       width=10, state='readonly')
+        self.cmb_format.set("xlsx")
+        self.cmb_format.grid(column=1, row=1, padx=5, pady=5, sticky='w')
+
+        self.use_cache = tk.IntVar(value=1)
+        self.chk_use_cache = ttk.Checkbutton(frame_columns, text="缓存 B 表（B 表未变化时跳过重新读取）",
+                                             variable=self.use_cache)
+        self.chk_use_cache.grid(column=2, row=1, padx=5, pady=5, sticky='w')
+
+        # 并行进程数：大于 1 时 A 表分块多进程匹配
+        ttk.Label(frame_columns, text="并行进程数：").grid(column=0, row=2, padx=5, pady=5, sticky='e')
+        cpu = os.cpu_count() or 1
+        self.cmb_workers = ttk.Combobox(frame_columns, values=[str(n) for n in (1, 2, 4, 8, 16) if n <= max(1, cpu)],
+                                        width=10, state='readonly')
+        self.cmb_workers.set("1")
+        self.cmb_workers.grid(column=1, row=2, padx=5, pady=5, sticky='w')
+
+        # 匹配模式：token 交集 / TF-IDF 排序
+        frame_mode = ttk.Frame(frame_columns)
+        frame_mode.grid(column=2, row=2, padx=5, pady=5, sticky='w')
+        ttk.Label(frame_mode, text="匹配模式：").pack(side='left')
+        self.cmb_mode = ttk.Combobox(frame_mode, values=list(pro_tool.MATCH_MODES), width=10, state='readonly')
+        self.cmb_mode.set("token")
+        self.cmb_mode.pack(side='left')
+
+        # 分块流式写出：每块结果立即写入文件，停止时保留已完成部分
+        self.stream = tk.IntVar(value=0)
+        self.chk_stream = ttk.Checkbutton(frame_columns, text="分块写出（大表省内存，停止时保留已完成部分）",
+                                          variable=self.stream)
+        self.chk_stream.grid(column=2, row=3, padx=5, pady=5, sticky='w')
+
+        # 检查点：按块保存进度到输出目录，中断后可从上次完成处继续（默认关闭）
+        self.checkpoint = tk.IntVar(value=0)
+        self.chk_checkpoint = ttk.Checkbutton(frame_columns, text="保存检查点（中断后可继续）",
+                                              variable=self.checkpoint)
+        self.chk_checkpoint.grid(column=2, row=4, padx=5, pady=5, sticky='w')
         # === 操作按钮 ===
         btn_frame = ttk.Frame(frame_columns)
-        btn_frame.grid(column=0, row=1, columnspan=3, padx=5, pady=5, sticky='w')
+        btn_frame.grid(column=0, row=5, columnspan=3, padx=5, pady=5, sticky='w')
         self.btn_start = ttk.Button(btn_frame, text="开始匹配", command=self.start_matching)
         self.btn_start.pack(side='left', padx=6)
         self.btn_stop = ttk.Button(btn_frame, text="停止（安全）",
@@ -113,7 +151,8 @@ class GeneProApp:
 
     # ---------- 文件操作 ----------
     def _browse_file(self, which):
-        ft = [("Excel files", "*.xlsx *.xls"), ("CSV files", "*.csv"), ("All files", "*.*")]
+        ft = [("Excel files", "*.xlsx *.xls"), ("CSV files", "*.csv"),
+              ("共线性二进制存储", "*.gcol"), ("All files", "*.*")]
         path = filedialog.askopenfilename(title="选择文件", filetypes=ft)
         if not path:
             return
@@ -139,17 +178,8 @@ class GeneProApp:
 
     def _load_cols_for_file(self, which, path):
         """智能读取文件表头并填充对应 Combobox（用于浏览时自动加载）"""
-        ext = os.path.splitext(path)[1].lower()
-        # 仅读取表头（nrows=0），减少 IO 与内存
-        if ext in ['.xls', '.xlsx']:
-            dfh = pd.read_excel(path, nrows=0)
-        else:
-            # 尝试 utf-8，再 gbk，兼容常见 CSV 编码
-            try:
-                dfh = pd.read_csv(path, nrows=0, encoding='utf-8')
-            except Exception:
-                dfh = pd.read_csv(path, nrows=0, encoding='gbk')
-        cols = list(dfh.columns.astype(str))
+        # 仅读取表头，减少 IO 与内存；CSV 自动兼容 utf-8 / gbk，.gcol 只读 schema
+        cols = [str(c) for c in pro_tool.read_header(path)]
         if which == 'A':
             self.cmb_a_col['values'] = cols
             if cols:
@@ -233,13 +263,27 @@ class GeneProApp:
             self.cmb_b1.get().strip(),
             self.cmb_b2.get().strip(),
             bool(self.export_other.get()),
-            ratio_val
+            ratio_val,
+            self.cmb_format.get() or "xlsx",
+            bool(self.use_cache.get()),
+            int(self.cmb_workers.get() or 1),
+            self.cmb_mode.get() or "token",
+            bool(self.stream.get()),
+            bool(self.checkpoint.get())
         )
 
-        if not all(params[:-2]):  # 确保 A/B 文件、输出目录和列已选择（不检查 ratio）
+        if not all(params[:6]):  # 确保 A/B 文件、输出目录和列已选择（不检查 ratio 等参数）
             messagebox.showwarning("缺少参数", "请确保 A/B 文件、输出目录和列已选择。")
             return
 
+        # 勾选检查点且输出目录中有与当前输入和参数一致的检查点时，询问是否从上次中断处继续
+        a_path, b_path, out_folder, a_col, b1, b2, export_other, ratio_val = params[:8]
+        done = pro_tool.checkpoint_progress(out_folder, a_path, b_path, a_col, b1, b2, export_other,
+                                            ratio_val, params[11]) if params[13] else None
+        resume = bool(done) and messagebox.askyesno(
+            "继续上次任务", f"检测到上次中断的任务（已完成 {done} 行），是否从检查点继续？\n选择“否”将重新开始。")
+        params = params + (resume,)
+
         self._set_ui_state(False)
         self.stop_flag = False
         self.progress_main['value'] = 0
@@ -259,8 +303,9 @@ class GeneProApp:
         state = 'normal' if enabled else 'disabled'
         widgets = [
             self.entry_a, self.entry_b, self.entry_out,
-            self.cmb_a_col, self.cmb_b1, self.cmb_b2,
+            self.cmb_a_col, self.cmb_b1, self.cmb_b2, self.cmb_format, self.cmb_workers, self.cmb_mode,
             self.chk_export_other if hasattr(self, 'chk_export_other') else None,
+            self.chk_use_cache, self.chk_stream, self.chk_checkpoint,
             self.btn_start
         ]
         for w in widgets:
@@ -281,7 +326,8 @@ class GeneProApp:
             self.root.after(0, lambda: self.btn_stop.config(state='disabled'))
 
     # ---------- 主匹配逻辑 ----------
-    def _worker(self, a_path, b_path, out_folder, a_col, b1, b2, export_other, threshold_ratio):
+    def _worker(self, a_path, b_path, out_folder, a_col, b1, b2, export_other, threshold_ratio, output_format, use_cache, workers,
+                match_mode, stream, checkpoint, resume):
         # UI 回调包装：将外部回调通过 root.after 发送到主线程
         def ui_progress(pct):
             try:
@@ -301,10 +347,20 @@ class GeneProApp:
             threshold_ratio=threshold_ratio,
             progress_cb=ui_progress,
             status_cb=ui_status,
-            stop_flag_getter=lambda: self.stop_flag
+            stop_flag_getter=lambda: self.stop_flag,
+            output_format=output_format,
+            use_cache=use_cache,
+            workers=workers,
+            match_mode=match_mode,
+            stream=stream,
+            checkpoint=checkpoint,
+            resume=resume
         )
 
-        if out_file:
+        if out_file and self.stop_flag:
+            note = "\n进度已保存，下次开始时可从检查点继续。" if checkpoint else ""
+            self.root.after(0, lambda: messagebox.showinfo("已中止", f"已完成部分的输出文件：\n{out_file}{note}"))
+        elif out_file:
             self.root.after(0, lambda: messagebox.showinfo("完成", f"输出文件：\n{out_file}"))
         else:
             if self.stop_flag:
@@ -143,7 +143,8 @@ pip install pandas numpy matplotlib networkx openpyxl xlsxwriter
   3. 点击“生成图形”以预览网络；可保存为 PNG。
 - 参数与提示：
   - 若选择权重列，程序会按 (node1,node2) 聚合并取权重均值作为边权值。
-  - 对于节点数非常多的数据，布局计算（spring_layout）可能较慢，请考虑先筛选子网络或限制绘制节点数。
+  - 节点数不超过 1000 时使用 spring_layout；更大的网络自动按连通分量分别布局（谱布局初始化 + 网格近似力导向），再打包排布。
+    命令行 plot network 可用 --layout spring/fast/spectral 指定布局引擎。
   - 图形颜色映射表示节点度（连接数），并可显示边权数值（两位小数）。
 
 4.6 共线性可视化（热图 / 散点图）
@@ -166,7 +167,7 @@ pip install pandas numpy matplotlib networkx openpyxl xlsxwriter
   - 使用 CSV 而非 Excel 有时更快；读取 CSV 时指定合适的 encoding 与 dtype。
   - 避免在 UI 线程进行大量计算，程序已对关键流程使用后台线程（Pro 版本亦如此）。
 - 可视化：
-  - networkx spring_layout 对大图耗时显著，可考虑降采样节点或只绘制核心子网。
+  - networkx spring_layout 对大图耗时显著，超过 1000 个节点时已自动改用近似布局；数万节点时仍建议只绘制核心子网。
 
 7. 常见问题（FAQ）
 ---------
@@ -1,9 +1,27 @@
-from .cv_tool import *
-from .gene_operations import * 
-from . import cv_tool
-from . import gene_operations
- 
-# package_tool init - expose pro_tool submodule
-from . import pro_tool
-
-__all__ = ['cv_tool', 'gene_operations']
\ No newline at end of file
+# package_tool 的子模块按需导入（PEP 562）：导入本包本身很轻，
+# cv_tool（matplotlib、networkx）与 gene_operations（pandas、openpyxl）在首次访问时才加载。
+# 原先通过 from .cv_tool import * / from .gene_operations import * 暴露的名称
+# （如 package_tool.fuzzy_match_with_progress、package_tool.plot_network）仍可直接访问。
+import importlib
+
+_SUBMODULES = ("cv_tool", "gene_operations", "pro_tool", "io_tool", "cache_tool", "checkpoint_tool",
+               "gcol_tool")
+# 查找顺序与原先 import * 的覆盖关系一致：后导入的 gene_operations 优先
+_STAR_MODULES = ("gene_operations", "cv_tool")
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    if not name.startswith("_"):
+        for mod_name in _STAR_MODULES:
+            mod = importlib.import_module(f".{mod_name}", __name__)
+            if hasattr(mod, name):
+                value = getattr(mod, name)
+                globals()[name] = value
+                return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(set(globals()) | set(_SUBMODULES))
+
+__all__ = ['cv_tool', 'gene_operations']
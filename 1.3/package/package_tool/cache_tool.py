@@ -0,0 +1,110 @@
+import os
+import json
+import pickle
+import hashlib
+
+# 缓存目录，可用环境变量 GENE_TOOL_CACHE 覆盖
+CACHE_DIR = os.environ.get("GENE_TOOL_CACHE", os.path.join(os.path.expanduser("~"), ".gene_tool_cache"))
+# 缓存总大小上限（字节），超出后按最近使用时间淘汰
+MAX_CACHE_BYTES = 2 * 1024 ** 3
+# 进程内缓存层：启用后同一进程中重复使用的 B 表与索引直接复用内存中的对象（批量任务用）
+_memory = None
+
+def enable_memory_cache():
+    global _memory
+    if _memory is None:
+        _memory = {}
+
+def disable_memory_cache():
+    global _memory
+    _memory = None
+
+def cache_key(path, columns, kind):
+    """由文件路径、修改时间、大小、所选列与缓存类型生成缓存键"""
+    st = os.stat(path)
+    raw = json.dumps([os.path.abspath(path), st.st_mtime_ns, st.st_size,
+                      [str(c) for c in (columns or [])], kind], ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+def _entry_path(key, cache_dir):
+    return os.path.join(cache_dir or CACHE_DIR, f"{key}.pkl")
+
+def load(key, cache_dir=None):
+    """读取缓存，不存在或损坏时返回 None；命中时刷新使用时间"""
+    p = _entry_path(key, cache_dir)
+    if not os.path.exists(p):
+        return None
+    try:
+        with open(p, "rb") as f:
+            obj = pickle.load(f)
+        os.utime(p, None)
+        return obj
+    except Exception:
+        return None
+
+def store(key, obj, cache_dir=None, max_bytes=None):
+    """写入缓存（先写临时文件再替换，避免中断留下半个文件），随后执行淘汰"""
+    cache_dir = cache_dir or CACHE_DIR
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        p = _entry_path(key, cache_dir)
+        tmp = f"{p}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, p)
+        evict(cache_dir, max_bytes)
+    except Exception:
+        pass
+
+def evict(cache_dir=None, max_bytes=None):
+    """按最近使用时间（LRU）删除旧缓存，直到总大小不超过 max_bytes"""
+    cache_dir = cache_dir or CACHE_DIR
+    max_bytes = MAX_CACHE_BYTES if max_bytes is None else max_bytes
+    entries = []
+    for name in os.listdir(cache_dir):
+        if name.endswith(".pkl"):
+            st = os.stat(os.path.join(cache_dir, name))
+            entries.append((st.st_mtime, st.st_size, name))
+    total = sum(e[1] for e in entries)
+    for _, size, name in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(os.path.join(cache_dir, name))
+            total -= size
+        except OSError:
+            pass
+
+def clear_cache(cache_dir=None):
+    cache_dir = cache_dir or CACHE_DIR
+    if os.path.isdir(cache_dir):
+        for name in os.listdir(cache_dir):
+            if name.endswith(".pkl"):
+                os.remove(os.path.join(cache_dir, name))
+
+def cached(path, columns, kind, builder, use_cache=True, cache_dir=None, set_progress_status=None):
+    """命中缓存则直接返回，否则调用 builder() 构建并写入缓存
+
+    启用进程内缓存层时先查内存，其次（use_cache=True 时）查磁盘缓存；返回的对象被多个任务共享，调用方不应修改。
+    """
+    if not use_cache and _memory is None:
+        return builder()
+    try:
+        key = cache_key(path, columns, kind)
+    except OSError:
+        return builder()
+    if _memory is not None and key in _memory:
+        if set_progress_status:
+            set_progress_status("已从内存缓存加载...")
+        return _memory[key]
+    obj = load(key, cache_dir) if use_cache else None
+    if obj is not None:
+        if set_progress_status:
+            set_progress_status("已从缓存加载...")
+    else:
+        obj = builder()
+        if use_cache:
+            store(key, obj, cache_dir)
+    if _memory is not None:
+        _memory[key] = obj
+    return obj
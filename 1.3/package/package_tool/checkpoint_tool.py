@@ -0,0 +1,75 @@
+import os
+import json
+import pickle
+import shutil
+
+STATE_FILE = "state.json"
+
+def fingerprint(path):
+    """输入文件指纹：绝对路径、大小、修改时间，任一变化即视为输入已改变"""
+    st = os.stat(path)
+    return [os.path.abspath(path), st.st_size, st.st_mtime_ns]
+
+def _write_atomic(path, data, mode="wb"):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, mode, **({} if "b" in mode else {"encoding": "utf-8"})) as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+class Checkpoint:
+    """断点续跑检查点目录
+
+    state.json 记录输入文件指纹、运行参数、已处理行数与分块数；每个分块的部分结果
+    单独 pickle 为 part_xxxxx.pkl。先写分块再替换 state.json，中途崩溃时最多丢失正在写的一块。
+    """
+
+    def __init__(self, ckpt_dir, inputs, params):
+        self.dir = ckpt_dir
+        # 经 JSON 往返一次，保证与从 state.json 读回的内容可直接比较
+        self.signature = json.loads(json.dumps({"inputs": [fingerprint(p) for p in inputs],
+                                                "params": params}, ensure_ascii=False, default=str))
+        self._parts = 0
+
+    @property
+    def _state_path(self):
+        return os.path.join(self.dir, STATE_FILE)
+
+    def _part_path(self, i):
+        return os.path.join(self.dir, f"part_{i:05d}.pkl")
+
+    def state(self):
+        """返回与当前输入、参数一致的检查点状态 {done, parts}，不存在或不一致时返回 None"""
+        try:
+            with open(self._state_path, encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if state.get("signature") != self.signature:
+            return None
+        return state
+
+    def resume(self):
+        """载入检查点并返回已处理行数；不存在或输入已改变时抛出 ValueError"""
+        state = self.state()
+        if state is None:
+            raise ValueError("未找到与当前输入文件和参数一致的检查点，无法续跑。")
+        self._parts = state["parts"]
+        return state["done"]
+
+    def parts(self):
+        """按顺序逐个读取已保存的部分结果"""
+        for i in range(self._parts):
+            with open(self._part_path(i), "rb") as f:
+                yield pickle.load(f)
+
+    def append(self, obj, done):
+        """保存一个分块的部分结果，并把已处理行数更新为 done"""
+        os.makedirs(self.dir, exist_ok=True)
+        _write_atomic(self._part_path(self._parts), pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+        self._parts += 1
+        state = {"signature": self.signature, "done": done, "parts": self._parts}
+        _write_atomic(self._state_path, json.dumps(state, ensure_ascii=False), mode="w")
+
+    def clear(self):
+        self._parts = 0
+        shutil.rmtree(self.dir, ignore_errors=True)
@@ -1,3 +1,6 @@
+import hashlib
+from collections import OrderedDict
+
 import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
@@ -48,8 +51,366 @@ def _resolve_args(obj_or_df, x_col, y_col, weight_col, show_plot):
     return df, x_col, y_col, weight_col, show_plot, status_var
 
 
-def plot_network(obj_or_df=None, x_col=None, y_col=None, weight_col=None, show_plot=None):
-    """绘制关系网络图"""
+# 网络图节点间的最小距离（归一化坐标）与去重叠的最大轮数
+MIN_NODE_DIST = 0.05
+OVERLAP_ROUNDS = 10
+# 网格邻域：本格与右、右上、上、左上四格，每对相邻格只比较一次
+_GRID_OFFSETS = ((0, 0), (1, 0), (1, 1), (0, 1), (-1, 1))
+
+
+def _close_pairs_grid(xy, min_dist):
+    """无 scipy 时的空间哈希：按 min_dist 大小的网格分桶，只比较相邻格内的点"""
+    cells = pd.DataFrame({"cx": np.floor(xy[:, 0] / min_dist).astype(np.int64),
+                          "cy": np.floor(xy[:, 1] / min_dist).astype(np.int64),
+                          "i": np.arange(len(xy))})
+    pairs = []
+    for ox, oy in _GRID_OFFSETS:
+        other = cells.assign(cx=cells["cx"] - ox, cy=cells["cy"] - oy).rename(columns={"i": "j"})
+        m = cells.merge(other, on=["cx", "cy"])
+        if (ox, oy) == (0, 0):
+            m = m[m["i"] < m["j"]]
+        pairs.append(m[["i", "j"]].to_numpy())
+    pairs = np.concatenate(pairs) if pairs else np.empty((0, 2), dtype=np.int64)
+    d = xy[pairs[:, 1]] - xy[pairs[:, 0]]
+    return pairs[np.hypot(d[:, 0], d[:, 1]) < min_dist]
+
+
+def _close_pairs(xy, min_dist):
+    """返回距离小于 min_dist 的点对 (i, j)，优先使用 scipy 的 cKDTree"""
+    try:
+        from scipy.spatial import cKDTree
+    except ImportError:
+        return _close_pairs_grid(xy, min_dist)
+    return cKDTree(xy).query_pairs(min_dist, output_type="ndarray")
+
+
+def _remove_overlaps(xy, min_dist=MIN_NODE_DIST, rounds=OVERLAP_ROUNDS):
+    """把距离小于 min_dist 的节点沿连线方向各推开一半差距，最多迭代 rounds 轮
+
+    每轮只查询邻近点对并向量化累加位移，节点数较多时也近似线性。
+    """
+    xy = np.array(xy, dtype=float)
+    for _ in range(rounds):
+        pairs = _close_pairs(xy, min_dist)
+        if not len(pairs):
+            break
+        i, j = pairs[:, 0], pairs[:, 1]
+        d = xy[j] - xy[i]
+        dist = np.hypot(d[:, 0], d[:, 1])
+        keep = dist > 0
+        i, j, d, dist = i[keep], j[keep], d[keep], dist[keep]
+        if not len(i):
+            break
+        push = d / dist[:, None] * ((min_dist - dist) / 2)[:, None]
+        disp = np.zeros_like(xy)
+        np.add.at(disp, i, -push)
+        np.add.at(disp, j, push)
+        xy += disp
+    return xy
+
+
+# 网络图布局引擎：spring 为 networkx 原有布局；fast 为网格近似的力导向布局；
+# spectral 先用稀疏拉普拉斯矩阵的谱布局初始化再少量迭代细化；auto 按节点数自动选择
+LAYOUT_ENGINES = ("auto", "spring", "fast", "spectral")
+# auto 模式下节点数不超过该值时仍使用 spring_layout
+SPRING_MAX_NODES = 1000
+FAST_ITERATIONS = 50
+SPECTRAL_ITERATIONS = 15
+# 近场排斥只计算每个节点最近的若干邻居，邻居表每隔若干轮重建一次
+NEAR_NEIGHBORS = 8
+NEIGHBOR_REFRESH = 5
+# 远场网格每边的格数上限：格质心两两排斥的数组大小为 格数²，上限 32 时约 1024² 对（数十 MB）
+MAX_GRID_BINS = 32
+# 节点数不超过该值的连通分量按大小分组批量布局，只有更大的分量逐个做力导向布局
+SMALL_COMPONENT_NODES = 32
+# 批量布局时每组一次处理的 分量数 × 节点数² 上限，限制两两排斥数组的内存
+SMALL_BATCH_CELLS = 1 << 20
+
+
+def _choose_layout(layout, num_nodes):
+    layout = (layout or "auto").lower()
+    if layout not in LAYOUT_ENGINES:
+        raise ValueError(f"不支持的布局: {layout}（可选: {', '.join(LAYOUT_ENGINES)}）")
+    if layout != "auto":
+        return layout
+    if num_nodes <= SPRING_MAX_NODES:
+        return "spring"
+    try:
+        import scipy  # noqa: F401
+        return "spectral"
+    except ImportError:
+        return "fast"
+
+
+def _force_layout(xy, src, dst, iterations, rng):
+    """向量化的 Fruchterman–Reingold 布局，返回单位正方形内的坐标
+
+    远场排斥按网格近似（类似 Barnes–Hut）：先算各格质心之间的排斥，同格节点共用；
+    格内节点再受本格质心的排斥，最近的 NEAR_NEIGHBORS 个邻居精确计算（需 scipy）。
+    每轮 O(n + 格数²)，格数不超过 MAX_GRID_BINS²，内存随节点数线性增长；引力沿边用 np.bincount 累加。
+    """
+    n = len(xy)
+    xy = np.array(xy, dtype=float) + rng.normal(scale=1e-4, size=(n, 2))
+    span = xy.max(axis=0) - xy.min(axis=0)
+    xy = (xy - xy.min(axis=0)) / np.where(span > 0, span, 1.0)
+    k = 1.0 / np.sqrt(n)
+    bins = min(MAX_GRID_BINS, max(4, int(2 * n ** 0.25)))
+    try:
+        from scipy.spatial import cKDTree
+    except ImportError:
+        cKDTree = None
+
+    for it in range(iterations):
+        temp = 0.1 * (1 - it / iterations) + 1e-3
+        disp = np.zeros_like(xy)
+        lo, hi = xy.min(axis=0), xy.max(axis=0) + 1e-9
+        cell = np.minimum(((xy - lo) / (hi - lo) * bins).astype(np.int64), bins - 1)
+        cid = cell[:, 0] * bins + cell[:, 1]
+        occupied, cid = np.unique(cid, return_inverse=True)
+        mass = np.bincount(cid).astype(float)
+        centers = np.column_stack([np.bincount(cid, xy[:, 0]), np.bincount(cid, xy[:, 1])]) / mass[:, None]
+        # 以格子尺寸软化，避免相邻格质心或节点与本格质心过近时排斥力发散
+        eps2 = float((((hi - lo) / bins) ** 2).sum())
+        d = centers[:, None, :] - centers[None, :, :]
+        f = k * k * mass[None, :] / ((d ** 2).sum(axis=2) + eps2)
+        disp += (d * f[:, :, None]).sum(axis=1)[cid]
+        d = xy - centers[cid]
+        disp += d * (k * k * (mass[cid] - 1) / ((d ** 2).sum(axis=1) + eps2))[:, None]
+        if cKDTree is not None and n > 1:
+            if it % NEIGHBOR_REFRESH == 0:
+                nb = cKDTree(xy).query(xy, k=min(NEAR_NEIGHBORS + 1, n))[1][:, 1:]
+            d = xy[:, None, :] - xy[nb]
+            r2 = np.maximum((d ** 2).sum(axis=2), 1e-12)
+            disp += (d * (k * k / r2)[:, :, None]).sum(axis=1)
+        if len(src):
+            d = xy[src] - xy[dst]
+            f = d * (np.hypot(d[:, 0], d[:, 1]) / k)[:, None]
+            for axis in (0, 1):
+                disp[:, axis] += np.bincount(dst, f[:, axis], n) - np.bincount(src, f[:, axis], n)
+        length = np.maximum(np.hypot(disp[:, 0], disp[:, 1]), 1e-12)
+        xy += disp / length[:, None] * np.minimum(length, temp)[:, None]
+    span = xy.max(axis=0) - xy.min(axis=0)
+    return (xy - xy.min(axis=0)) / np.where(span > 0, span, 1.0)
+
+
+def _spectral_init(sub, rng):
+    """谱布局初始坐标；大图时 networkx 使用 scipy 稀疏特征分解，失败时退回随机坐标"""
+    try:
+        pos = nx.spectral_layout(sub)
+        return np.array([pos[v] for v in sub.nodes()], dtype=float)
+    except Exception:
+        return rng.random((sub.number_of_nodes(), 2))
+
+
+def _small_components_layout(G, comps, iterations, rng):
+    """小连通分量的批量布局，返回 [(节点列表, 单位正方形内的坐标)]
+
+    同样大小（m 个节点）的分量堆叠为 (分量数, m, 2) 数组，从圆周模板出发一次向量化迭代全部分量：
+    分量内两两排斥精确计算，引力沿边用 np.bincount 累加。1–2 个节点的分量直接取固定模板。
+    """
+    by_size = {}
+    for comp in comps:
+        by_size.setdefault(len(comp), []).append(list(comp))
+    parts = []
+    for m, group in by_size.items():
+        if m <= 2:
+            xy = np.array([[0.0, 0.5], [1.0, 0.5]])[:m] if m == 2 else np.array([[0.5, 0.5]])
+            parts.extend((nodes, xy) for nodes in group)
+            continue
+        angle = 2 * np.pi * np.arange(m) / m
+        template = 0.5 + 0.5 * np.column_stack([np.cos(angle), np.sin(angle)])
+        k = 1.0 / np.sqrt(m)
+        batch = max(1, SMALL_BATCH_CELLS // (m * m))
+        for b in range(0, len(group), batch):
+            comps_b = group[b:b + batch]
+            nodes = [v for comp in comps_b for v in comp]
+            local = pd.Index(nodes)
+            edges = list(G.subgraph(nodes).edges())
+            src = local.get_indexer([u for u, _ in edges])
+            dst = local.get_indexer([v for _, v in edges])
+            n = len(nodes)
+            xy = np.broadcast_to(template, (len(comps_b), m, 2)) + rng.normal(scale=1e-4, size=(len(comps_b), m, 2))
+            for it in range(iterations):
+                temp = 0.1 * (1 - it / iterations) + 1e-3
+                d = xy[:, :, None, :] - xy[:, None, :, :]
+                r2 = np.maximum((d ** 2).sum(axis=3), 1e-12)
+                disp = (d * (k * k / r2)[..., None]).sum(axis=2).reshape(n, 2)
+                flat = xy.reshape(n, 2)
+                if len(src):
+                    d = flat[src] - flat[dst]
+                    f = d * (np.hypot(d[:, 0], d[:, 1]) / k)[:, None]
+                    for axis in (0, 1):
+                        disp[:, axis] += np.bincount(dst, f[:, axis], n) - np.bincount(src, f[:, axis], n)
+                length = np.maximum(np.hypot(disp[:, 0], disp[:, 1]), 1e-12)
+                xy = (flat + disp / length[:, None] * np.minimum(length, temp)[:, None]).reshape(-1, m, 2)
+            lo = xy.min(axis=1, keepdims=True)
+            span = xy.max(axis=1, keepdims=True) - lo
+            xy = (xy - lo) / np.where(span > 0, span, 1.0)
+            parts.extend(zip(comps_b, xy))
+    return parts
+
+
+def _pack_components(parts, pad=1.0):
+    """把各连通分量的布局按面积缩放后逐行排布（shelf packing），返回 {节点: (x, y)}
+
+    parts 为 [(节点列表, 单位正方形内的坐标)]，按节点数从大到小排列。
+    """
+    sides = [np.sqrt(len(nodes)) for nodes, _ in parts]
+    width = np.sqrt(sum((s + pad) ** 2 for s in sides))
+    pos, x, y, row_h = {}, 0.0, 0.0, 0.0
+    for (nodes, xy), side in zip(parts, sides):
+        if x > 0 and x + side > width:
+            x, y, row_h = 0.0, y + row_h + pad, 0.0
+        for v, (px, py) in zip(nodes, (xy * side).tolist()):
+            pos[v] = (x + px, y + py)
+        x += side + pad
+        row_h = max(row_h, side)
+    return pos
+
+
+def _component_layout(G, engine, seed=42, init=None):
+    """按连通分量分别布局（fast / spectral）后打包排布
+
+    不超过 SMALL_COMPONENT_NODES 个节点的分量批量布局（见 _small_components_layout）；
+    更大的分量逐个布局，init 为已有布局 {节点: (x, y)} 时以其为初始坐标（新节点随机），只做少量迭代细化。
+    """
+    rng = np.random.default_rng(seed)
+    comps = sorted(nx.connected_components(G), key=len, reverse=True)
+    small = [c for c in comps if len(c) <= SMALL_COMPONENT_NODES]
+    parts = []
+    for comp in comps[:len(comps) - len(small)]:
+        sub = G.subgraph(comp)
+        nodes = list(sub.nodes())
+        local = pd.Index(nodes)
+        edges = list(sub.edges())
+        src, dst = local.get_indexer([u for u, _ in edges]), local.get_indexer([v for _, v in edges])
+        if init is not None:
+            start = np.array([init[v] if v in init else rng.random(2) for v in nodes], dtype=float)
+            xy = _force_layout(start, src, dst, SPECTRAL_ITERATIONS, rng)
+        elif engine == "spectral":
+            xy = _force_layout(_spectral_init(sub, rng), src, dst, SPECTRAL_ITERATIONS, rng)
+        else:
+            xy = _force_layout(rng.random((len(nodes), 2)), src, dst, FAST_ITERATIONS, rng)
+        parts.append((nodes, xy))
+    if small:
+        iterations = SPECTRAL_ITERATIONS if init is not None or engine == "spectral" else FAST_ITERATIONS
+        parts.extend(_small_components_layout(G, small, iterations, rng))
+        # 批量布局按分量大小分组输出，恢复从大到小的顺序再打包
+        parts.sort(key=lambda p: len(p[0]), reverse=True)
+    return _pack_components(parts)
+
+
+# 布局缓存：键为 节点/边集合 + 布局引擎 的哈希（不含权重），只改权重列或样式重绘时直接复用坐标；
+# 内存中按最近使用保留 LAYOUT_CACHE_SIZE 个，use_cache=True 时同时写入 cache_tool 的磁盘缓存目录
+LAYOUT_CACHE_SIZE = 8
+# 边集合变化时，若上一次布局使用相同引擎、且新图中至少有该比例的节点出现在其中，则以上一次的坐标热启动
+WARM_START_MIN_SHARED = 0.5
+_layout_cache = OrderedDict()
+# 上一次布局 (引擎, {节点: (x, y)})
+_last_layout = None
+
+
+def _layout_key(G, engine):
+    """节点/边集合的哈希，与行顺序、边方向无关"""
+    u = np.array([str(a) for a, _ in G.edges()], dtype=object)
+    v = np.array([str(b) for _, b in G.edges()], dtype=object)
+    swap = u > v
+    u[swap], v[swap] = v[swap], u[swap]
+    edges = np.sort(pd.util.hash_array(u) * np.uint64(1000003) ^ pd.util.hash_array(v))
+    nodes = np.sort(pd.util.hash_array(np.array([str(n) for n in G.nodes()], dtype=object)))
+    digest = hashlib.sha1(f"layout-{engine}-{len(nodes)}-{len(edges)}".encode("utf-8"))
+    digest.update(nodes.tobytes())
+    digest.update(edges.tobytes())
+    return digest.hexdigest()
+
+
+def _remember_layout(key, engine, pos, use_cache):
+    global _last_layout
+    _layout_cache[key] = pos
+    _layout_cache.move_to_end(key)
+    while len(_layout_cache) > LAYOUT_CACHE_SIZE:
+        _layout_cache.popitem(last=False)
+    _last_layout = (engine, pos)
+    if use_cache:
+        from . import cache_tool
+        cache_tool.store(key, pos)
+
+
+def _cached_layout(key, use_cache):
+    pos = _layout_cache.get(key)
+    if pos is None and use_cache:
+        from . import cache_tool
+        pos = cache_tool.load(key)
+    return pos
+
+
+def clear_layout_cache():
+    global _last_layout
+    _layout_cache.clear()
+    _last_layout = None
+
+
+def _network_positions(G, layout="auto", use_cache=False):
+    """计算网络图节点坐标（布局 + 归一化 + 抖动 + 去重叠），返回新的 {节点: (x, y)}
+
+    相同节点/边集合命中布局缓存时直接返回缓存坐标；否则若上一次布局使用相同引擎且共享足够多的节点，
+    以上一次的坐标为初始位置、减少迭代次数热启动；引擎不同时按所选引擎从头布局。
+    """
+    np.random.seed(42)
+    num_nodes = G.number_of_nodes()
+    k_value = 10 / np.sqrt(np.sqrt(num_nodes)) if num_nodes > 1 else 0.5
+    iterations = min(2000, max(50, 1000 // max(1, num_nodes // 10)))
+
+    engine = _choose_layout(layout, num_nodes)
+    key = _layout_key(G, engine)
+    pos = _cached_layout(key, use_cache)
+    if pos is not None:
+        _remember_layout(key, engine, pos, False)
+        return dict(pos)
+
+    init = None
+    if _last_layout is not None and _last_layout[0] == engine:
+        last = _last_layout[1]
+        shared = sum(1 for n in G.nodes() if n in last)
+        if shared and shared >= WARM_START_MIN_SHARED * num_nodes:
+            init = last
+    if engine == "spring":
+        try:
+            if init is not None:
+                start = {n: init[n] for n in G.nodes() if n in init}
+                pos = nx.spring_layout(G, k=k_value, iterations=max(50, iterations // 4), pos=start)
+            else:
+                pos = nx.spring_layout(G, k=k_value, iterations=iterations)
+        except Exception:
+            pos = nx.spring_layout(G, k=0.5, iterations=50)
+    else:
+        pos = _component_layout(G, engine, init=init)
+
+    nodes_list = list(pos.keys())
+    pos_arr = np.array([pos[n] for n in nodes_list], dtype=float).reshape(-1, 2)
+    try:
+        min_xy, max_xy = pos_arr.min(axis=0), pos_arr.max(axis=0)
+        scale = 1.4
+        pos_arr = scale * (pos_arr - min_xy) / (max_xy - min_xy + 1e-9)
+    except Exception:
+        pass
+
+    # 逐节点依次取 x、y 抖动，与原先逐个调用 np.random.uniform 的随机序列一致
+    pos_arr = pos_arr + np.random.uniform(-0.02, 0.02, size=pos_arr.shape)
+    pos_arr = _remove_overlaps(pos_arr, MIN_NODE_DIST)
+    pos = {n: (x, y) for n, (x, y) in zip(nodes_list, pos_arr.tolist())}
+    _remember_layout(key, engine, pos, use_cache)
+    return dict(pos)
+
+
+def plot_network(obj_or_df=None, x_col=None, y_col=None, weight_col=None, show_plot=None, layout="auto",
+                 use_cache=False):
+    """绘制关系网络图
+
+    layout 为布局引擎（见 LAYOUT_ENGINES）：auto 时小图沿用 spring_layout，
+    超过 SPRING_MAX_NODES 个节点时按连通分量使用谱初始化 + 网格近似力导向布局。
+    节点坐标按边集合缓存在内存中（见 _network_positions），use_cache=True 时同时缓存到磁盘。
+    """
     df, x_col, y_col, weight_col, show_plot, status_var = _resolve_args(obj_or_df, x_col, y_col, weight_col, show_plot)
 
     if df is None or not hasattr(df, "columns"):
@@ -62,65 +423,24 @@ def plot_network(obj_or_df=None, x_col=None, y_col=None, weight_col=None, show_p
     if not y_col:
         y_col = df.columns[1] if len(df.columns) > 1 else x_col
 
+    # 整列取出后一次性加入图（不逐行 iterrows），边与节点的加入顺序与原先逐行构建一致
     G = nx.Graph()
-
     if weight_col and weight_col in df.columns and weight_col != "--- 请选择 ---":
         df_temp = df[[x_col, y_col, weight_col]].copy()
         df_temp[weight_col] = pd.to_numeric(df_temp[weight_col], errors="coerce").fillna(0)
         df_grouped = df_temp.groupby([x_col, y_col])[weight_col].mean().reset_index()
-        edges = [(r[x_col], r[y_col], {"weight": r[weight_col]}) for _, r in df_grouped.iterrows()]
+        G.add_weighted_edges_from(zip(df_grouped[x_col].to_numpy(dtype=object), df_grouped[y_col].to_numpy(dtype=object),
+                                      df_grouped[weight_col].to_numpy().tolist()))
     else:
         df_edges = df[[x_col, y_col]].drop_duplicates()
-        edges = [(r[x_col], r[y_col]) for _, r in df_edges.iterrows()]
-
-    G.add_edges_from(edges)
+        G.add_edges_from(zip(df_edges[x_col].to_numpy(dtype=object), df_edges[y_col].to_numpy(dtype=object)))
 
     if G.number_of_nodes() == 0:
         if status_var is not None:
             status_var.set("❌ 数据中没有找到任何节点关系。")
         return None
 
-    np.random.seed(42)
-    num_nodes = G.number_of_nodes()
-    k_value = 10 / np.sqrt(np.sqrt(num_nodes)) if num_nodes > 1 else 0.5
-    iterations = min(2000, max(50, 1000 // max(1, num_nodes // 10)))
-
-    try:
-        pos = nx.spring_layout(G, k=k_value, iterations=iterations)
-    except Exception:
-        pos = nx.spring_layout(G, k=0.5, iterations=50)
-
-    try:
-        pos_arr = np.array(list(pos.values()))
-        if pos_arr.size == 0:
-            pos_arr = np.array([[0.0, 0.0]])
-        min_xy, max_xy = pos_arr.min(axis=0), pos_arr.max(axis=0)
-        scale = 1.4
-        dx = max_xy[0] - min_xy[0]
-        dy = max_xy[1] - min_xy[1]
-        for n in pos:
-            pos[n] = (
-                scale * (pos[n][0] - min_xy[0]) / (dx + 1e-9),
-                scale * (pos[n][1] - min_xy[1]) / (dy + 1e-9),
-            )
-    except Exception:
-        pass
-
-    for n in pos:
-        pos[n] = (pos[n][0] + np.random.uniform(-0.02, 0.02), pos[n][1] + np.random.uniform(-0.02, 0.02))
-
-    min_dist = 0.05
-    nodes_list = list(pos.keys())
-    for i in range(len(nodes_list)):
-        for j in range(i + 1, len(nodes_list)):
-            ni, nj = nodes_list[i], nodes_list[j]
-            dx = pos[nj][0] - pos[ni][0]
-            dy = pos[nj][1] - pos[ni][1]
-            dist = np.sqrt(dx ** 2 + dy ** 2)
-            if dist < min_dist and dist > 0:
-                shift = (min_dist - dist) / 2
-                pos[ni] = (pos[ni][0] - dx / dist * shift, pos[ni][1] - dy / dist * shift)
-                pos[nj] = (pos[nj][0] + dx / dist * shift, pos[nj][1] + dy / dist * shift)
+    pos = _network_positions(G, layout, use_cache)
 
     degrees = dict(G.degree())
     fixed_size = 300
@@ -289,18 +609,18 @@ def plot_chord(obj_or_df=None, col1=None, col2=None, show_plot=None):
             status_var.set("❌ 弦图至少需要选择 **第一列 (X)** 和 **第二列 (Y)**！")
         return None
 
-    nodes = sorted(set(data[col1]).union(set(data[col2])))
+    nodes = sorted(pd.unique(np.concatenate([data[col1].to_numpy(dtype=object), data[col2].to_numpy(dtype=object)])))
     n = len(nodes)
     if n == 0:
         if status_var is not None:
             status_var.set("❌ 数据中未发现节点！")
         return None
-    node_index = {v: i for i, v in enumerate(nodes)}
-    matrix = np.zeros((n, n))
-    for a, b in data.values:
-        i, j = node_index[a], node_index[b]
-        matrix[i, j] += 1
-        matrix[j, i] += 1
+    # 每条关系在 (i, j) 与 (j, i) 各计一次，自身关系在对角线上计两次
+    node_index = pd.Index(nodes, dtype=object)
+    i = node_index.get_indexer(data[col1].to_numpy(dtype=object))
+    j = node_index.get_indexer(data[col2].to_numpy(dtype=object))
+    counts = np.bincount(i * n + j, minlength=n * n).reshape(n, n).astype(float)
+    matrix = counts + counts.T
     total = np.sum(matrix)
     if total == 0:
         if status_var is not None:
@@ -348,30 +668,27 @@ def plot_chord(obj_or_df=None, col1=None, col2=None, show_plot=None):
                 ha=ha, va="center", fontsize=9, color="black")
 
     max_m = np.max(matrix) if np.max(matrix) > 0 else 1
-    for i in range(n):
-        for j in range(i + 1, n):
-            if matrix[i, j] <= 0:
-                continue
-            v = matrix[i, j]
-            a1 = 0.5 * (starts[i] + ends[i])
-            a2 = 0.5 * (starts[j] + ends[j])
-            p1 = angle_to_point(a1, inner_radius)
-            p2 = angle_to_point(a2, inner_radius)
-            verts = [
-                (p1[0], p1[1]),
-                (p1[0] * 0.4, p1[1] * 0.4),
-                (p2[0] * 0.4, p2[1] * 0.4),
-                (p2[0], p2[1]),
-            ]
-            codes = [Path.MOVETO, Path.CURVE4, Path.CURVE4, Path.CURVE4]
-            path = Path(verts, codes)
-            patch = PathPatch(
-                path, facecolor="none",
-                edgecolor=colors[i],
-                lw=0.8 + 3 * (v / max_m),
-                alpha=0.4 + 0.6 * (v / max_m)
-            )
-            ax.add_patch(patch)
+    for i, j in zip(*np.nonzero(np.triu(matrix, k=1) > 0)):
+        v = matrix[i, j]
+        a1 = 0.5 * (starts[i] + ends[i])
+        a2 = 0.5 * (starts[j] + ends[j])
+        p1 = angle_to_point(a1, inner_radius)
+        p2 = angle_to_point(a2, inner_radius)
+        verts = [
+            (p1[0], p1[1]),
+            (p1[0] * 0.4, p1[1] * 0.4),
+            (p2[0] * 0.4, p2[1] * 0.4),
+            (p2[0], p2[1]),
+        ]
+        codes = [Path.MOVETO, Path.CURVE4, Path.CURVE4, Path.CURVE4]
+        path = Path(verts, codes)
+        patch = PathPatch(
+            path, facecolor="none",
+            edgecolor=colors[i],
+            lw=0.8 + 3 * (v / max_m),
+            alpha=0.4 + 0.6 * (v / max_m)
+        )
+        ax.add_patch(patch)
 
     ax.set_aspect("equal")
     try:
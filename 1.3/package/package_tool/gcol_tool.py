@@ -0,0 +1,151 @@
+# 共线性结果的二进制存储 .gcol：一个 Arrow IPC 文件（与 Feather V2 相同的容器），列为
+#     Block    int32                   Alignment 编号，Unassigned 为 -1
+#     GeneA    dictionary<int32, str>  基因名编码，GeneA / GeneB 共用同一份基因字典
+#     GeneB    dictionary<int32, str>
+#     E-value  float64
+# 各 Block 的起止行号以 JSON 写在 schema 元数据中。读取时内存映射文件、不解析文本，
+# 数百万对的数据集可在毫秒级打开。需要安装 pyarrow。
+import json
+
+import numpy as np
+import pandas as pd
+
+from .io_tool import STR_DTYPE
+
+GCOL_VERSION = "1"
+GCOL_COLUMNS = ["Block", "GeneA", "GeneB", "E-value"]
+# 每个 record batch 的行数
+BATCH_ROWS = 1 << 20
+
+def _require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise ImportError(".gcol 格式需要安装 pyarrow：pip install pyarrow")
+
+class GcolWriter:
+    """逐块接收已解析的共线性表（Block / GeneA / GeneB / E-value），关闭时写出 .gcol
+
+    基因名在写入过程中增量编码为整数，内存中只保留编码数组与基因字典。
+    """
+
+    def __init__(self, path):
+        _require_pyarrow()
+        self.path = path
+        self.rows = 0
+        self._genes = pd.Index([], dtype=object)
+        self._chunks = []
+
+    def _encode(self, a, b):
+        """把两列基因名编码为全局基因字典中的编号，缺失值为 -1
+
+        先用 pyarrow 对本块做字典编码，只有本块的去重基因名需要与全局字典比对。
+        """
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        chunks = []
+        for s in (a, b):
+            arr = pa.array(s.array if s.dtype != object else s, type=pa.string())
+            chunks.extend(arr.chunks if isinstance(arr, pa.ChunkedArray) else [arr])
+        encoded = pc.dictionary_encode(pa.chunked_array(chunks, type=pa.string()).combine_chunks())
+        codes = encoded.indices.fill_null(-1).to_numpy(zero_copy_only=False)
+        uniques = encoded.dictionary.to_numpy(zero_copy_only=False)
+        ids = self._genes.get_indexer(uniques)
+        new = ids < 0
+        if new.any():
+            ids[new] = np.arange(len(self._genes), len(self._genes) + int(new.sum()))
+            self._genes = self._genes.append(pd.Index(uniques[new], dtype=object))
+        ids = ids.astype(np.int32)
+        glob = np.where(codes >= 0, ids[codes], -1).astype(np.int32) if len(ids) else np.full(len(codes), -1, np.int32)
+        return glob[:len(a)], glob[len(a):]
+
+    def write(self, df):
+        if not len(df):
+            return
+        block = pd.to_numeric(df["Block"].astype(str).str.extract(r"^(\d+)", expand=False), errors="coerce") \
+            if not pd.api.types.is_integer_dtype(df["Block"]) else df["Block"]
+        gene_a, gene_b = self._encode(df["GeneA"], df["GeneB"])
+        evalue = pd.to_numeric(df["E-value"], errors="coerce")
+        self._chunks.append((block.fillna(-1).to_numpy(dtype=np.int32), gene_a, gene_b,
+                             evalue.to_numpy(dtype=np.float64, na_value=np.nan)))
+        self.rows += len(df)
+
+    def close(self):
+        import pyarrow as pa
+        import pyarrow.ipc as ipc
+        cols = [np.concatenate(c) if c else np.empty(0, dtype=t)
+                for c, t in zip(zip(*self._chunks) if self._chunks else ([], [], [], []),
+                                (np.int32, np.int32, np.int32, np.float64))]
+        self._chunks = []
+        block, gene_a, gene_b, evalue = cols
+        genes = pa.array(self._genes.to_numpy(dtype=object), type=pa.string())
+
+        def dict_col(codes):
+            return pa.DictionaryArray.from_arrays(pa.array(codes, mask=codes < 0, type=pa.int32()), genes)
+
+        # Block 在文件中按出现顺序连续，记录每段的起止行号
+        starts = np.r_[0, np.flatnonzero(np.diff(block)) + 1] if len(block) else np.empty(0, dtype=np.int64)
+        meta = {"gcol.version": GCOL_VERSION,
+                "gcol.blocks": json.dumps({"block": block[starts].tolist(), "start": starts.tolist()})}
+        table = pa.table({"Block": pa.array(block, type=pa.int32()), "GeneA": dict_col(gene_a),
+                          "GeneB": dict_col(gene_b), "E-value": pa.array(evalue, type=pa.float64())})
+        table = table.replace_schema_metadata(meta)
+        with pa.OSFile(self.path, "wb") as sink, ipc.new_file(sink, table.schema) as w:
+            w.write_table(table, max_chunksize=BATCH_ROWS)
+        return self.path
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if exc[0] is None:
+            self.close()
+
+def _open(path):
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+    return ipc.open_file(pa.memory_map(path, "r"))
+
+def read_gcol_columns(path):
+    _require_pyarrow()
+    return list(_open(path).schema.names)
+
+def read_gcol(path, columns=None, decode=True):
+    """内存映射读取 .gcol，返回 DataFrame
+
+    decode=True 时基因列解码为字符串列（STR_DTYPE），与读取其他表格格式的结果一致；
+    decode=False 时保留为 Categorical（共用基因字典，几乎不额外占用内存）。
+    """
+    _require_pyarrow()
+    import pyarrow as pa
+    table = _open(path).read_all()
+    if columns is not None:
+        wanted = set(columns)
+        table = table.select([c for c in table.column_names if c in wanted])
+    data, gene_dtype = {}, None
+    for name, col in zip(table.column_names, table.columns):
+        if not pa.types.is_dictionary(col.type):
+            data[name] = col.to_pandas()
+        elif not decode:
+            # 各 batch 共用同一份基因字典，直接拼接编码，免去 to_pandas 逐块合并字典
+            codes = np.concatenate([c.indices.fill_null(-1).to_numpy(zero_copy_only=False) for c in col.chunks]) \
+                if col.num_chunks else np.empty(0, dtype=np.int32)
+            if gene_dtype is None:
+                # GeneA / GeneB 共用基因字典，只构建一次类别
+                genes = col.chunk(0).dictionary if col.num_chunks else pa.array([], type=pa.string())
+                gene_dtype = pd.CategoricalDtype(pd.Index(genes.to_numpy(zero_copy_only=False), dtype=object))
+            data[name] = pd.Categorical.from_codes(codes, dtype=gene_dtype)
+        else:
+            col = pa.chunked_array([c.dictionary_decode() for c in col.chunks], type=col.type.value_type)
+            data[name] = col.to_pandas() if STR_DTYPE == str else pd.Series(pd.arrays.ArrowStringArray(col))
+    return pd.DataFrame(data, columns=table.column_names)
+
+def gcol_blocks(path):
+    """返回各 Block 的起止行号 DataFrame（Block, start, stop），可配合 read_gcol 按块切片"""
+    _require_pyarrow()
+    reader = _open(path)
+    meta = json.loads((reader.schema.metadata or {}).get(b"gcol.blocks", b'{"block": [], "start": []}'))
+    starts = np.asarray(meta["start"], dtype=np.int64)
+    total = sum(reader.get_batch(i).num_rows for i in range(reader.num_record_batches))
+    stops = np.r_[starts[1:], total].astype(np.int64) if len(starts) else starts
+    return pd.DataFrame({"Block": np.asarray(meta["block"], dtype=np.int32), "start": starts, "stop": stops})
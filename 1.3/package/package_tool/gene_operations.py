@@ -1,6 +1,12 @@
+from collections.abc import Mapping
+import numpy as np
 import pandas as pd
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import PatternFill
+from .io_tool import check_format, output_path, read_table, write_table
+from . import cache_tool
+from . import checkpoint_tool
 
 # ---------------- 基础工具 ----------------
 def validate_columns(df, *cols, set_progress_status=None):
@@ -20,23 +26,145 @@ def build_bidirectional_map(df, col1, col2, set_progress_status=None):
             b_to_a.setdefault(b,set()).add(a)
     return a_to_b, b_to_a
 
-def recursive_search(keys, a_to_b, b_to_a, depth=3, fuzzy=False, set_progress_status=None, sub_progress_callback=None):
+class CSRAdjacency(Mapping):
+    """只读邻接表：基因 ID 编码为 int32，邻居以 CSR（indptr/indices）数组存放
+
+    行为与 build_bidirectional_map 返回的 {基因: set} 字典一致，
+    可直接传给 recursive_search 等函数；单次查询为 O(度数)。
+    """
+
+    def __init__(self, labels, label_index, indptr, indices):
+        self.labels = labels
+        self.label_index = label_index
+        self.indptr = indptr
+        self.indices = indices
+
+    def _code(self, key):
+        try:
+            code = self.label_index.get_loc(key)
+        except (KeyError, TypeError):
+            raise KeyError(key)
+        if self.indptr[code] == self.indptr[code+1]:
+            raise KeyError(key)
+        return code
+
+    def __getitem__(self, key):
+        code = self._code(key)
+        return set(self.labels[self.indices[self.indptr[code]:self.indptr[code+1]]].tolist())
+
+    def __iter__(self):
+        codes = np.flatnonzero(np.diff(self.indptr))
+        return iter(self.labels[codes].tolist())
+
+    def __len__(self):
+        return int(np.count_nonzero(np.diff(self.indptr)))
+
+def _csr(src, dst, n):
+    order = np.lexsort((dst, src))
+    indptr = np.zeros(n+1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+    return indptr, dst[order].astype(np.int32)
+
+def build_compact_graph(df, col1, col2, set_progress_status=None):
+    """build_bidirectional_map 的紧凑版本
+
+    用 pd.factorize 把两列基因 ID 统一编码为 int32，邻接关系存为 CSR 数组，
+    返回 (a_to_b, b_to_a) 两个 CSRAdjacency，接口与原字典相同，内存占用低一个数量级。
+    """
+    if set_progress_status:
+        set_progress_status("构建紧凑映射...")
+    n_rows = len(df)
+    codes, uniques = pd.factorize(pd.concat([df[col1], df[col2]], ignore_index=True))
+    codes = codes.astype(np.int64)
+    src, dst = codes[:n_rows], codes[n_rows:]
+    valid = (src >= 0) & (dst >= 0)
+    n = len(uniques)
+    # 去除重复边（与 set 语义一致）
+    pairs = np.unique(src[valid]*n + dst[valid])
+    src, dst = pairs // n, pairs % n
+    labels = np.asarray(uniques, dtype=object)
+    label_index = pd.Index(labels, dtype=object)
+    a_to_b = CSRAdjacency(labels, label_index, *_csr(src, dst, n))
+    b_to_a = CSRAdjacency(labels, label_index, *_csr(dst, src, n))
+    return a_to_b, b_to_a
+
+class SubstringIndex:
+    """键的 n-gram 倒排索引，用于快速找出"包含某子串"的键
+
+    对每个键的字符串形式切出所有长度为 n 的片段，记录片段 -> 键序号 的倒排表。
+    查询时取查询串各片段倒排表的交集作为候选，再用 `in` 逐一校验，
+    结果与逐键线性扫描 `key in str(k)` 完全一致。倒排表建好后固化为有序 int32 数组以节省内存。
+    """
+
+    def __init__(self, keys, n=3):
+        self.n = n
+        self.keys = list(keys)
+        self.texts = [str(k) for k in self.keys]
+        postings = {}
+        for i, text in enumerate(self.texts):
+            for g in {text[j:j + n] for j in range(len(text) - n + 1)}:
+                postings.setdefault(g, []).append(i)
+        self.postings = {g: np.array(ids, dtype=np.int32) for g, ids in postings.items()}
+
+    def find(self, sub):
+        """返回字符串形式包含 sub 的所有键"""
+        n = self.n
+        if len(sub) < n:
+            # 过短的查询无法用 n-gram 过滤，退回线性扫描
+            return [k for k, t in zip(self.keys, self.texts) if sub in t]
+        grams = {sub[j:j + n] for j in range(len(sub) - n + 1)}
+        lists = []
+        for g in grams:
+            p = self.postings.get(g)
+            if p is None:
+                return []
+            lists.append(p)
+        lists.sort(key=len)
+        cand = lists[0]
+        for p in lists[1:]:
+            cand = np.intersect1d(cand, p, assume_unique=True)
+            if not len(cand):
+                return []
+        return [self.keys[i] for i in cand.tolist() if sub in self.texts[i]]
+
+
+def build_fuzzy_index(a_to_b, b_to_a, set_progress_status=None):
+    """为双向映射的两侧键分别建立子串索引，供 recursive_search 模糊模式使用"""
+    if set_progress_status:
+        set_progress_status("构建模糊索引...")
+    return SubstringIndex(a_to_b), SubstringIndex(b_to_a)
+
+def _expand_key(key, a_to_b, b_to_a, fuzzy=False, fuzzy_index=None):
+    """单个键向外扩展一跳得到的基因集合"""
+    if fuzzy and fuzzy_index is not None and isinstance(key, str):
+        index_a, index_b = fuzzy_index
+        found = {b for a in index_a.find(key) if a != key for b in a_to_b[a]}
+        found.update(a for b in index_b.find(key) if b != key for a in b_to_a[b])
+        return found
+    if fuzzy:
+        found = {b for a in a_to_b if key in str(a) and a != key for b in a_to_b[a]}
+        found.update(a for b in b_to_a if key in str(b) and b != key for a in b_to_a[b])
+        return found
+    return a_to_b.get(key,set()) | b_to_a.get(key,set())
+
+def recursive_search(keys, a_to_b, b_to_a, depth=3, fuzzy=False, set_progress_status=None, sub_progress_callback=None,
+                     fuzzy_index=None, expand_cache=None):
+    """fuzzy_index 为 build_fuzzy_index 的返回值；模糊模式下提供它可避免逐键线性扫描
+    expand_cache 为可选 dict，缓存每个键的一跳扩展结果，多次调用间共享以免重复计算
+    """
     found = set(keys)
     current = set(keys)
     for d in range(depth):
         next_found = set()
         total = len(current)
         for idx, key in enumerate(current):
-            if fuzzy:
-                next_found.update(
-                    b for a in a_to_b if key in str(a) and a != key for b in a_to_b[a]
-                )
-                next_found.update(
-                    a for b in b_to_a if key in str(b) and b != key for a in b_to_a[b]
-                )
+            if expand_cache is None:
+                next_found |= _expand_key(key, a_to_b, b_to_a, fuzzy, fuzzy_index)
             else:
-                next_found |= a_to_b.get(key,set())
-                next_found |= b_to_a.get(key,set())
+                step = expand_cache.get(key)
+                if step is None:
+                    step = expand_cache[key] = _expand_key(key, a_to_b, b_to_a, fuzzy, fuzzy_index)
+                next_found |= step
             if sub_progress_callback and total>0:
                 sub_progress_callback(int((idx+1)/total*100))
         new = next_found - found
@@ -46,127 +174,282 @@ def recursive_search(keys, a_to_b, b_to_a, depth=3, fuzzy=False, set_progress_st
         current = new
     return found - set(keys)
 
-# ---------------- 核心功能 ----------------
-def fuzzy_match_with_progress(file_a, file_b, output_file, gene_column_a, gene_id_column_b, collinear_gene_column_b,
-                              progress_callback=None, sub_progress_callback=None, set_progress_status=None, vertical=False):
-    df_a = pd.read_excel(file_a)
-    df_b = pd.read_excel(file_b)
-    validate_columns(df_a, gene_column_a, set_progress_status=set_progress_status)
-    validate_columns(df_b, gene_id_column_b, collinear_gene_column_b, set_progress_status=set_progress_status)
-    a_to_b, b_to_a = build_bidirectional_map(df_b, gene_id_column_b, collinear_gene_column_b, set_progress_status=set_progress_status)
+def batch_recursive_search(genes, a_to_b, b_to_a, depth=3, fuzzy=False, fuzzy_index=None,
+                           progress_callback=None, set_progress_status=None, expand_cache=None):
+    """对一批基因执行 recursive_search，返回 {基因: 结果集合}
 
-    all_matches=[]
-    all_flags=[]
-    total=len(df_a)
-    for i, gene in enumerate(df_a[gene_column_a]):
-        if pd.isnull(gene):
-            all_matches.append([])
-            all_flags.append([])
-            if progress_callback:
-                progress_callback(int((i+1)/total*100))
-            continue
-
-        exact = recursive_search({gene}, a_to_b, b_to_a, depth=3, fuzzy=False,
-                                 set_progress_status=set_progress_status, sub_progress_callback=sub_progress_callback)
-        fuzzy = recursive_search({gene}, a_to_b, b_to_a, depth=3, fuzzy=True,
-                                 set_progress_status=set_progress_status, sub_progress_callback=sub_progress_callback)
-        exact_list = list(exact)
-        fuzzy_list = list(fuzzy - exact)
-        matches = exact_list + fuzzy_list
-        flags = [False]*len(exact_list) + [True]*len(fuzzy_list)
-        all_matches.append(matches)
-        all_flags.append(flags)
-        if progress_callback:
+    相同基因只计算一次；各基因 BFS 过程中遇到的键共享一跳扩展缓存，
+    邻域重叠的基因不再重复展开。分批调用时可传入同一个 expand_cache 跨批复用。空值基因被跳过。
+    """
+    distinct = list(dict.fromkeys(g for g in genes if not pd.isnull(g)))
+    expand_cache = {} if expand_cache is None else expand_cache
+    results = {}
+    total = len(distinct)
+    for i, gene in enumerate(distinct):
+        results[gene] = recursive_search({gene}, a_to_b, b_to_a, depth=depth, fuzzy=fuzzy,
+                                         fuzzy_index=fuzzy_index, expand_cache=expand_cache)
+        if progress_callback and total>0:
             progress_callback(int((i+1)/total*100))
-        if set_progress_status and (i%10==0 or i==total-1):
-            set_progress_status(f"处理进度：{i+1}/{total}")
+        if set_progress_status and (i%100==0 or i==total-1):
+            set_progress_status(f"{'模糊' if fuzzy else '精确'}检索：{i+1}/{total}")
+    return results
 
-    # 写入 Excel
-    wb = Workbook()
-    ws = wb.active
-    blue_fill = PatternFill(fill_type="solid", fgColor="87CEEB")
+def load_b_maps(file_b, gene_id_column_b, collinear_gene_column_b, compact=False, fuzzy=False,
+                use_cache=False, set_progress_status=None):
+    """读取 B 表并构建双向映射（fuzzy=True 时同时构建模糊索引），返回 (a_to_b, b_to_a, fuzzy_index)
 
-    if vertical:
-        # 原始列保持
-        for col_idx, col_name in enumerate(df_a.columns, 1):
-            ws.cell(row=1, column=col_idx, value=col_name)
-        ws.cell(row=1, column=len(df_a.columns)+1, value="匹配结果")
+    use_cache=True 时结果按 文件路径+修改时间+大小+所选列 缓存到本地，B 表未变化时跳过 Excel 解析
+    """
+    def build():
+        df_b = read_table(file_b, usecols=[gene_id_column_b, collinear_gene_column_b])
+        validate_columns(df_b, gene_id_column_b, collinear_gene_column_b, set_progress_status=set_progress_status)
+        build_map = build_compact_graph if compact else build_bidirectional_map
+        a_to_b, b_to_a = build_map(df_b, gene_id_column_b, collinear_gene_column_b, set_progress_status=set_progress_status)
+        fuzzy_index = build_fuzzy_index(a_to_b, b_to_a, set_progress_status=set_progress_status) if fuzzy else None
+        return a_to_b, b_to_a, fuzzy_index
 
-        current_row=2
-        for i, gene in enumerate(df_a[gene_column_a]):
-            info_row=df_a.iloc[i]
-            matches=all_matches[i]
-            flags=all_flags[i]
+    kind = f"bimap-{'csr' if compact else 'dict'}{'-fuzzy' if fuzzy else ''}"
+    return cache_tool.cached(file_b, [gene_id_column_b, collinear_gene_column_b], kind, build,
+                             use_cache=use_cache, set_progress_status=set_progress_status)
 
+def build_edge_frame(df, col1, col2, set_progress_status=None):
+    """把两列关系展开为双向去重边表 (src, dst)，dst 已转为字符串，不含自环"""
+    if set_progress_status:
+        set_progress_status("构建边表...")
+    pairs = df[[col1, col2]].dropna()
+    edges = pd.DataFrame({
+        "src": np.concatenate([pairs[col1].to_numpy(dtype=object), pairs[col2].to_numpy(dtype=object)]),
+        "dst": np.concatenate([pairs[col2].to_numpy(dtype=object), pairs[col1].to_numpy(dtype=object)]),
+    }).drop_duplicates()
+    edges = edges[edges["src"] != edges["dst"]]
+    edges["dst"] = edges["dst"].astype(str)
+    return edges.reset_index(drop=True)
+
+def load_b_edges(file_b, gene_id_column_b, collinear_gene_column_b, use_cache=False, set_progress_status=None):
+    """读取 B 表并构建 build_edge_frame 边表，use_cache 含义同 load_b_maps"""
+    def build():
+        df_b = read_table(file_b, usecols=[gene_id_column_b, collinear_gene_column_b])
+        validate_columns(df_b, gene_id_column_b, collinear_gene_column_b, set_progress_status=set_progress_status)
+        return build_edge_frame(df_b, gene_id_column_b, collinear_gene_column_b, set_progress_status=set_progress_status)
+
+    return cache_tool.cached(file_b, [gene_id_column_b, collinear_gene_column_b], "edges", build,
+                             use_cache=use_cache, set_progress_status=set_progress_status)
+
+def correspondence_series(genes, edges, progress_callback=None, chunk_size=100000):
+    """向量化的一跳查询：返回与 genes 对齐的 "匹配结果" 字符串列
+
+    先把边表筛到查询中出现的基因，按 src 分组拼接一次，再分块映射回 genes，
+    每处理完一块回调一次进度。
+    """
+    query = pd.Index(pd.unique(genes.dropna()), dtype=object)
+    edges = edges[query.get_indexer(edges["src"].to_numpy(dtype=object)) >= 0]
+    # 按 src 编码排序后切段拼接，避免 groupby.agg 的逐组调用开销
+    codes, uniques = pd.factorize(edges["src"].to_numpy(dtype=object))
+    order = np.argsort(codes, kind="stable")
+    dst = edges["dst"].to_numpy(dtype=object)[order]
+    bounds = np.flatnonzero(np.diff(codes[order])) + 1
+    starts, ends = np.r_[0, bounds], np.r_[bounds, len(order)]
+    agg = pd.Series([", ".join(dst[a:b]) for a, b in zip(starts, ends)] if len(order) else [],
+                    index=pd.Index(uniques, dtype=object), dtype=object)
+    total = len(genes)
+    parts = []
+    for start in range(0, total, chunk_size):
+        parts.append(genes.iloc[start:start+chunk_size].map(agg).fillna(""))
+        if progress_callback:
+            progress_callback(int(min(start+chunk_size, total)/total*100))
+    if not parts:
+        return pd.Series([], dtype=object, index=genes.index)
+    return pd.concat(parts)
+
+# ---------------- 结果输出 ----------------
+def iter_match_rows(df_a, gene_column_a, all_matches, all_flags, vertical=False):
+    """逐行生成匹配结果表：(行内容列表, 模糊匹配列下标列表)，第一行为表头"""
+    if vertical:
+        # 原始列保持
+        n_cols = len(df_a.columns)
+        yield list(df_a.columns) + ["匹配结果"], []
+        for info_row, matches, flags in zip(df_a.itertuples(index=False, name=None), all_matches, all_flags):
+            info_row = list(info_row)
             if matches:
                 for match, is_fuzzy in zip(matches, flags):
-                    for col_idx, col_name in enumerate(df_a.columns,1):
-                        ws.cell(row=current_row, column=col_idx, value=info_row[col_name])
-                    cell = ws.cell(row=current_row, column=len(df_a.columns)+1, value=match)
-                    if is_fuzzy:
-                        cell.fill = blue_fill
-                    current_row+=1
+                    yield info_row + [match], [n_cols] if is_fuzzy else []
             else:
                 # 保留空格行
-                for col_idx, col_name in enumerate(df_a.columns,1):
-                    ws.cell(row=current_row, column=col_idx, value=info_row[col_name])
-                ws.cell(row=current_row, column=len(df_a.columns)+1, value="")
-                current_row+=1
+                yield info_row + [""], []
     else:
         # 横向排列
         max_len = max(len(m) for m in all_matches) if all_matches else 0
-        ws.cell(row=1,column=1,value=gene_column_a)
-        for j in range(max_len):
-            ws.cell(row=1,column=2+j,value=f"匹配结果{j+1}")
-
-        for i, gene in enumerate(df_a[gene_column_a],2):
-            ws.cell(row=i,column=1,value=gene)
-            matches=all_matches[i-2]
-            flags=all_flags[i-2]
-            for j in range(max_len):
-                val = matches[j] if j<len(matches) else ""
-                cell = ws.cell(row=i,column=2+j,value=val)
-                if j<len(flags) and flags[j]:
-                    cell.fill=blue_fill
+        yield [gene_column_a] + [f"匹配结果{j+1}" for j in range(max_len)], []
+        for gene, matches, flags in zip(df_a[gene_column_a], all_matches, all_flags):
+            row = [gene] + list(matches) + [""]*(max_len-len(matches))
+            yield row, [1+j for j, f in enumerate(flags) if f]
+
+def match_frame(df_a, gene_column_a, all_matches, all_flags, vertical=False):
+    """构建列式输出用的结果表，模糊/精确标记存为布尔列而非单元格底色"""
+    if vertical:
+        counts = np.array([max(1, len(m)) for m in all_matches], dtype=np.int64)
+        out = df_a.take(np.repeat(np.arange(len(df_a)), counts)).reset_index(drop=True)
+        out["匹配结果"] = [v for m in all_matches for v in (m if m else [""])]
+        out["模糊匹配"] = np.array([v for f in all_flags for v in (f if f else [False])], dtype=bool)
+        return out
+    max_len = max(len(m) for m in all_matches) if all_matches else 0
+    # 所有列先收集到字典中再一次构建，逐列插入在列数较多时会产生碎片化的 DataFrame
+    columns = {gene_column_a: df_a[gene_column_a].values}
+    for j in range(max_len):
+        columns[f"匹配结果{j+1}"] = [m[j] if j < len(m) else "" for m in all_matches]
+        columns[f"模糊匹配{j+1}"] = np.array([j < len(f) and f[j] for f in all_flags], dtype=bool)
+    return pd.DataFrame(columns)
 
+def write_match_xlsx(output_file, rows):
+    """以 openpyxl 只写模式流式写出 rows，模糊匹配单元格标蓝"""
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Sheet")
+    blue_fill = PatternFill(fill_type="solid", fgColor="87CEEB")
+    for values, fuzzy_cols in rows:
+        if fuzzy_cols:
+            values = list(values)
+            for j in fuzzy_cols:
+                cell = WriteOnlyCell(ws, value=values[j])
+                cell.fill = blue_fill
+                values[j] = cell
+        ws.append(values)
     wb.save(output_file)
+
+# ---------------- 核心功能 ----------------
+# 模糊匹配每检索多少个基因保存一次检查点
+CHECKPOINT_GENES = 2000
+
+def fuzzy_match_with_progress(file_a, file_b, output_file, gene_column_a, gene_id_column_b, collinear_gene_column_b,
+                              progress_callback=None, sub_progress_callback=None, set_progress_status=None, vertical=False,
+                              compact=False, output_format="xlsx", use_cache=False,
+                              checkpoint=False, resume=False, stop_flag_getter=None):
+    """基因匹配，返回实际写出的文件路径（中止时返回 None）
+
+    compact=True 时使用 build_compact_graph 构建映射，适合全基因组规模的 B 表
+    output_format: xlsx / parquet / feather / tsv；非 xlsx 格式用布尔列“模糊匹配”代替蓝色底色
+    use_cache=True 时复用本地缓存的 B 表映射与模糊索引
+    checkpoint=True 时每检索 CHECKPOINT_GENES 个基因把结果保存到 output_file + ".ckpt"，
+    resume=True 时校验输入未变化后跳过检查点中已检索的基因；stop_flag_getter() 返回 True 时中止
+    """
+    output_format = check_format(output_format)
+    # 竖向输出需要 A 表全部列，横向只需目标列
+    df_a = read_table(file_a, usecols=None if vertical else [gene_column_a])
+    validate_columns(df_a, gene_column_a, set_progress_status=set_progress_status)
+    a_to_b, b_to_a, fuzzy_index = load_b_maps(file_b, gene_id_column_b, collinear_gene_column_b, compact=compact,
+                                              fuzzy=True, use_cache=use_cache, set_progress_status=set_progress_status)
+
+    genes = df_a[gene_column_a]
+    ckpt = None
+    exact_map, fuzzy_map = {}, {}
+    if checkpoint or resume:
+        params = {"gene_column_a": gene_column_a, "gene_id_column_b": gene_id_column_b,
+                  "collinear_gene_column_b": collinear_gene_column_b}
+        ckpt = checkpoint_tool.Checkpoint(output_file + ".ckpt", [file_a, file_b], params)
+        if resume:
+            ckpt.resume()
+            for exact_part, fuzzy_part in ckpt.parts():
+                exact_map.update(exact_part)
+                fuzzy_map.update(fuzzy_part)
+        else:
+            ckpt.clear()
+
+    # 按批检索：每批先精确后模糊，两类检索各自跨批共享一跳扩展缓存
+    distinct = list(dict.fromkeys(g for g in genes if not pd.isnull(g)))
+    pending = [g for g in distinct if g not in exact_map]
+    total = len(distinct)
+    exact_cache, fuzzy_cache = {}, {}
+    for start in range(0, len(pending), CHECKPOINT_GENES):
+        if stop_flag_getter and stop_flag_getter():
+            if set_progress_status:
+                set_progress_status("任务中止，进度已保存到检查点" if ckpt else "任务中止")
+            return None
+        batch = pending[start:start + CHECKPOINT_GENES]
+        exact_part = batch_recursive_search(batch, a_to_b, b_to_a, depth=3, fuzzy=False, expand_cache=exact_cache)
+        fuzzy_part = batch_recursive_search(batch, a_to_b, b_to_a, depth=3, fuzzy=True, fuzzy_index=fuzzy_index,
+                                            expand_cache=fuzzy_cache)
+        exact_map.update(exact_part)
+        fuzzy_map.update(fuzzy_part)
+        if ckpt is not None:
+            ckpt.append((exact_part, fuzzy_part), len(exact_map))
+        if progress_callback:
+            progress_callback(int(len(exact_map) / total * 100))
+        if set_progress_status:
+            set_progress_status(f"检索：{len(exact_map)}/{total}")
+
+    all_matches=[]
+    all_flags=[]
+    for gene in genes:
+        if pd.isnull(gene):
+            all_matches.append([])
+            all_flags.append([])
+            continue
+        exact = exact_map[gene]
+        exact_list = list(exact)
+        fuzzy_list = list(fuzzy_map[gene] - exact)
+        all_matches.append(exact_list + fuzzy_list)
+        all_flags.append([False]*len(exact_list) + [True]*len(fuzzy_list))
+
+    if output_format == "xlsx":
+        # 写入 Excel（只写模式逐行写出，内存占用不随结果规模增长）
+        output_file = output_path(output_file, output_format)
+        write_match_xlsx(output_file, iter_match_rows(df_a, gene_column_a, all_matches, all_flags, vertical))
+    else:
+        output_file = write_table(match_frame(df_a, gene_column_a, all_matches, all_flags, vertical),
+                                  output_file, output_format)
+    if ckpt is not None:
+        ckpt.clear()
     if set_progress_status:
         set_progress_status("保存完成")
     if progress_callback:
         progress_callback(100)
     if sub_progress_callback:
         sub_progress_callback(100)
+    return output_file
 
 def gene_correspondence_with_progress(file_a, file_b, output_file, gene_column_a, gene_id_column_b, collinear_gene_column_b,
-                                      progress_callback=None, sub_progress_callback=None, set_progress_status=None):
-    """基因查询（精确匹配横向）"""
-    df_a=pd.read_excel(file_a)
-    df_b=pd.read_excel(file_b)
-    validate_columns(df_a,gene_column_a,set_progress_status=set_progress_status)
-    validate_columns(df_b,gene_id_column_b,collinear_gene_column_b,set_progress_status=set_progress_status)
-    a_to_b,b_to_a=build_bidirectional_map(df_b,gene_id_column_b,collinear_gene_column_b,set_progress_status=set_progress_status)
+                                      progress_callback=None, sub_progress_callback=None, set_progress_status=None,
+                                      compact=False, output_format="xlsx", use_cache=False):
+    """基因查询（精确匹配横向），返回实际写出的文件路径
 
-    results=[]
-    total=len(df_a)
-    for i,gene in enumerate(df_a[gene_column_a]):
-        if pd.isnull(gene):
-            results.append({gene_column_a:gene,"匹配结果":""})
+    compact=True 时使用 build_compact_graph 构建映射，适合全基因组规模的 B 表
+    output_format: xlsx / parquet / feather / tsv
+    use_cache=True 时复用本地缓存的 B 表映射
+    """
+    output_format=check_format(output_format)
+    df_a=read_table(file_a,usecols=[gene_column_a])
+    validate_columns(df_a,gene_column_a,set_progress_status=set_progress_status)
+    if not compact:
+        # 向量化：边表按基因分组聚合后整体映射，不再逐行查询
+        edges=load_b_edges(file_b,gene_id_column_b,collinear_gene_column_b,
+                           use_cache=use_cache,set_progress_status=set_progress_status)
+        genes=df_a[gene_column_a].reset_index(drop=True)
+        results=pd.DataFrame({gene_column_a:genes,
+                              "匹配结果":correspondence_series(genes,edges,progress_callback=progress_callback).values})
+    else:
+        a_to_b,b_to_a,_=load_b_maps(file_b,gene_id_column_b,collinear_gene_column_b,compact=True,
+                                    use_cache=use_cache,set_progress_status=set_progress_status)
+        results=[]
+        total=len(df_a)
+        for i,gene in enumerate(df_a[gene_column_a]):
+            if pd.isnull(gene):
+                results.append({gene_column_a:gene,"匹配结果":""})
+                if progress_callback:
+                    progress_callback(int((i+1)/total*100))
+                continue
+            matches=a_to_b.get(gene,set())|b_to_a.get(gene,set())
+            matches.discard(gene)
+            row={gene_column_a:gene,"匹配结果":", ".join(map(str,matches)) if matches else ""}
+            results.append(row)
             if progress_callback:
                 progress_callback(int((i+1)/total*100))
-            continue
-        matches=a_to_b.get(gene,set())|b_to_a.get(gene,set())
-        matches.discard(gene)
-        row={gene_column_a:gene,"匹配结果":", ".join(map(str,matches)) if matches else ""}
-        results.append(row)
-        if progress_callback:
-            progress_callback(int((i+1)/total*100))
-    pd.DataFrame(results).to_excel(output_file,index=False,engine="openpyxl")
+    output_file=write_table(pd.DataFrame(results),output_file,output_format)
     if set_progress_status:
         set_progress_status("保存完成")
     if progress_callback:
         progress_callback(100)
     if sub_progress_callback:
         sub_progress_callback(100)
+    return output_file
 
 # 精确匹配横向
 def gene_search_with_progress(*args,**kwargs):
@@ -174,8 +457,6 @@ def gene_search_with_progress(*args,**kwargs):
 
 # 精确匹配竖向
 def classify_genes_with_progress(*args,**kwargs):
-    df_a=pd.read_excel(args[0])
-    df_b=pd.read_excel(args[1])
     gene_column_a=args[3]
     gene_id_column_b=args[4]
     collinear_gene_column_b=args[5]
@@ -185,4 +466,6 @@ def classify_genes_with_progress(*args,**kwargs):
                                      progress_callback=kwargs.get("progress_callback"),
                                      sub_progress_callback=kwargs.get("sub_progress_callback"),
                                      set_progress_status=kwargs.get("set_progress_status"),
-                                     vertical=vertical)
+                                     vertical=vertical,
+                                     output_format=kwargs.get("output_format","xlsx"),
+                                     use_cache=kwargs.get("use_cache",False))
@@ -0,0 +1,194 @@
+import os
+import pandas as pd
+
+# 支持的输出格式 -> 文件扩展名
+OUTPUT_FORMATS = {
+    "xlsx": ".xlsx",
+    "parquet": ".parquet",
+    "feather": ".feather",
+    "tsv": ".tsv",
+    "csv": ".csv",
+}
+# 共线性二进制存储（见 gcol_tool），只用于读取
+GCOL_EXT = ".gcol"
+# xlsx 单个工作表的最大行数（含表头）
+EXCEL_MAX_ROWS = 1048576
+
+# 支持读取的文本表格扩展名 -> 分隔符（可叠加 .gz/.bz2/.zip/.xz 压缩后缀）
+TEXT_SEPARATORS = {".csv": ",", ".tsv": "\t", ".tab": "\t", ".txt": "\t"}
+COMPRESSION_EXTS = (".gz", ".bz2", ".zip", ".xz")
+
+def _has_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+# 字符串列存储类型：有 pyarrow 时用 Arrow 字符串，内存约为 object 列的一半
+STR_DTYPE = "string[pyarrow]" if _has_pyarrow() else str
+
+def table_ext(path):
+    """返回去掉压缩后缀后的小写扩展名，如 a.tsv.gz -> .tsv"""
+    root, ext = os.path.splitext(path.lower())
+    if ext in COMPRESSION_EXTS:
+        ext = os.path.splitext(root)[1]
+    return ext
+
+def _read_text(path, sep, **kwargs):
+    """读取文本表格：优先 pyarrow 引擎，编码或引擎不支持时退回 C 引擎并兼容 gbk"""
+    if _has_pyarrow():
+        try:
+            return pd.read_csv(path, sep=sep, engine="pyarrow", **kwargs)
+        except Exception:
+            pass
+    try:
+        return pd.read_csv(path, sep=sep, encoding="utf-8", **kwargs)
+    except UnicodeDecodeError:
+        return pd.read_csv(path, sep=sep, encoding="gbk", **kwargs)
+
+def read_columns(path, sep=None):
+    """仅读取表头，返回列名列表；sep 覆盖文本格式按扩展名推断的分隔符"""
+    ext = table_ext(path)
+    if ext in (".xls", ".xlsx"):
+        return list(pd.read_excel(path, nrows=0).columns)
+    if ext == ".parquet":
+        import pyarrow.parquet as pq
+        return list(pq.read_schema(path).names)
+    if ext == ".feather":
+        import pyarrow.ipc as ipc
+        return list(ipc.open_file(path).schema.names)
+    if ext == GCOL_EXT:
+        from .gcol_tool import read_gcol_columns
+        return read_gcol_columns(path)
+    return list(_read_text(path, sep or TEXT_SEPARATORS.get(ext, ","), nrows=0).columns)
+
+def read_table(path, usecols=None, dtype=None, sep=None):
+    """按扩展名读取 Excel / CSV / TSV（含压缩）/ Parquet / Feather / .gcol
+
+    usecols 只解析所需列（不存在的列被忽略，由调用方的列校验报错）；
+    文本格式在安装 pyarrow 时使用 pyarrow 引擎，sep 覆盖按扩展名推断的分隔符。
+    """
+    ext = table_ext(path)
+    if ext in (".xls", ".xlsx"):
+        wanted = None if usecols is None else set(usecols)
+        return pd.read_excel(path, dtype=dtype,
+                             usecols=None if wanted is None else (lambda c: c in wanted))
+    if ext == ".parquet":
+        cols = None if usecols is None else [c for c in read_columns(path) if c in set(usecols)]
+        df = pd.read_parquet(path, columns=cols)
+        return df if dtype is None else df.astype(dtype)
+    if ext == ".feather":
+        cols = None if usecols is None else [c for c in read_columns(path) if c in set(usecols)]
+        df = pd.read_feather(path, columns=cols)
+        return df if dtype is None else df.astype(dtype)
+    if ext == GCOL_EXT:
+        from .gcol_tool import read_gcol
+        df = read_gcol(path, columns=usecols)
+        return df if dtype is None else df.astype(dtype)
+    sep = sep or TEXT_SEPARATORS.get(ext, ",")
+    if usecols is not None:
+        usecols = [c for c in read_columns(path, sep) if c in set(usecols)]
+    return _read_text(path, sep, usecols=usecols, dtype=dtype)
+
+def check_format(fmt):
+    fmt = (fmt or "xlsx").lower()
+    if fmt not in OUTPUT_FORMATS:
+        raise ValueError(f"不支持的输出格式: {fmt}（可选: {', '.join(OUTPUT_FORMATS)}）")
+    return fmt
+
+def output_path(path, fmt):
+    """将输出路径的扩展名替换为 fmt 对应的扩展名"""
+    fmt = check_format(fmt)
+    return os.path.splitext(path)[0] + OUTPUT_FORMATS[fmt]
+
+def _arrow_safe(df):
+    """object 列统一转为字符串，避免 pyarrow 遇到混合类型列时报错"""
+    df = df.reset_index(drop=True)
+    for c in df.columns:
+        if df[c].dtype == object:
+            df[c] = df[c].map(lambda v: v if v is None or isinstance(v, str) else str(v)).astype("string")
+    df.columns = [str(c) for c in df.columns]
+    return df
+
+def write_table(df, path, fmt="xlsx"):
+    """按 fmt 写出 DataFrame，返回实际写出的路径"""
+    fmt = check_format(fmt)
+    path = output_path(path, fmt)
+    if fmt == "xlsx":
+        df.to_excel(path, index=False, engine="openpyxl")
+    elif fmt == "parquet":
+        _arrow_safe(df).to_parquet(path, index=False)
+    elif fmt == "feather":
+        _arrow_safe(df).to_feather(path)
+    else:
+        df.to_csv(path, sep="\t" if fmt == "tsv" else ",", index=False)
+    return path
+
+class TableStreamWriter:
+    """分块追加写出表格，内存中只保留当前块
+
+    tsv / csv 追加写文本；parquet 每块写一个 row group；feather 写 Arrow IPC 记录批次；
+    xlsx 使用 xlsxwriter constant_memory 模式逐行写出。首块确定列结构（parquet/feather
+    之后的块转换为首块的 schema），文件在写入首块时才创建。close() 之后文件即完整可读，
+    中途停止时已写入的块同样有效。
+    """
+
+    def __init__(self, path, fmt="xlsx", sheet_name="Sheet1"):
+        self.fmt = check_format(fmt)
+        self.path = output_path(path, self.fmt)
+        self.sheet_name = sheet_name
+        self.rows = 0
+        self._writer = None
+        self._sheet = None
+        self._schema = None
+
+    def write(self, df):
+        if df.empty:
+            return
+        if self.fmt in ("tsv", "csv"):
+            df.to_csv(self.path, sep="\t" if self.fmt == "tsv" else ",", index=False,
+                      mode="a" if self.rows else "w", header=not self.rows)
+        elif self.fmt == "xlsx":
+            self._write_xlsx(df)
+        else:
+            import pyarrow as pa
+            table = pa.Table.from_pandas(_arrow_safe(df), preserve_index=False)
+            if self._writer is None:
+                self._schema = table.schema
+                if self.fmt == "parquet":
+                    import pyarrow.parquet as pq
+                    self._writer = pq.ParquetWriter(self.path, self._schema)
+                else:
+                    import pyarrow.ipc as ipc
+                    self._writer = ipc.new_file(self.path, self._schema)
+            else:
+                table = table.cast(self._schema)
+            self._writer.write_table(table)
+        self.rows += len(df)
+
+    def _write_xlsx(self, df):
+        if self.rows + len(df) >= EXCEL_MAX_ROWS:
+            raise ValueError(f"结果超过 Excel 单表 {EXCEL_MAX_ROWS - 1} 行的上限，请改用 csv / tsv / parquet 输出。")
+        if self._writer is None:
+            import xlsxwriter
+            self._writer = xlsxwriter.Workbook(self.path, {'constant_memory': True})
+            self._sheet = self._writer.add_worksheet(self.sheet_name)
+            # 表头样式与 pandas.to_excel 一致：加粗、细边框、居中
+            header = self._writer.add_format({'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'})
+            self._sheet.write_row(0, 0, [str(c) for c in df.columns], header)
+        values = df.astype(object).where(df.notna(), None)
+        for i, row in enumerate(values.itertuples(index=False, name=None), start=self.rows + 1):
+            self._sheet.write_row(i, 0, row)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
@@ -1,8 +1,15 @@
 import os
+import sys
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime
+import numpy as np
 import pandas as pd
 import re
 from collections import defaultdict
+from .io_tool import OUTPUT_FORMATS, STR_DTYPE, TableStreamWriter, check_format, read_columns, read_table, table_ext, write_table
+from . import cache_tool
+from . import checkpoint_tool
 
 def _normalize(s: str) -> str:
     return s.strip().lower()
@@ -10,185 +17,556 @@ def _normalize(s: str) -> str:
 def _tokens(s: str):
     return re.findall(r'\w+', s.lower())
 
-def _read_table(path):
-    ext = os.path.splitext(path)[1].lower()
-    if ext in ['.xls', '.xlsx']:
-        df = pd.read_excel(path, dtype=str)
-    else:
-        try:
-            df = pd.read_csv(path, dtype=str, encoding='utf-8')
-        except Exception:
-            df = pd.read_csv(path, dtype=str, encoding='gbk')
-    return df.fillna('').astype(str)
+def _text_sep(path):
+    """专业匹配一直按逗号读取 .txt（.tsv / .tab 仍按制表符），与早期版本的输入保持兼容"""
+    return "," if table_ext(path) == ".txt" else None
 
-def pro_match(a_path, b_path, out_folder, a_col, b1, b2, export_other=True,
-              threshold_ratio=0.6, progress_cb=None, status_cb=None, stop_flag_getter=None):
-    """
-    执行匹配并写出结果文件。
-    返回生成的输出文件路径，若无结果或被中断则返回 None。
-    progress_cb(percent:int) - 可选，接受 0-100
-    status_cb(text:str) - 可选，用于显示状态
-    stop_flag_getter() - 可选，返回 True 则立即中断（安全退出，可能已写部分结果）
+def read_header(path):
+    """读取专业匹配输入表的列名，分隔符规则与 _read_table 一致"""
+    return read_columns(path, sep=_text_sep(path))
+
+def _read_table(path, usecols=None):
+    """以字符串类型读取表格，usecols 为 None 时读取全部列
+
+    安装 pyarrow 时使用 string[pyarrow] 存储，缺失值逐列原地填充为空串，
+    不再整表 fillna().astype(str) 复制一遍。
     """
-    if status_cb:
-        status_cb("读取文件中...")
-    df_a = _read_table(a_path)
-    df_b = _read_table(b_path)
-    if df_a.empty:
-        raise ValueError("A 表为空。")
+    df = read_table(path, usecols=usecols, dtype=STR_DTYPE, sep=_text_sep(path))
+    for c in df.columns:
+        if df[c].hasnans:
+            df[c] = df[c].fillna('')
+    return df
 
-    if out_folder and not os.path.exists(out_folder):
-        os.makedirs(out_folder, exist_ok=True)
+# 模糊匹配每个 A 值最多保留的候选键数
+MAX_CAND = 500
+# 拼接后的倒排数组长度超过 键总数 × 该值 时改用 np.bincount 按键编号计数，不再排序
+BINCOUNT_RATIO = 1.5
+# 常见 token 的倒排表总长至少为稀有 token 的该倍数时，才尝试只对稀有 token 计数
+SKIP_RATIO = 4
 
-    cols_b = list(df_b.columns)
-    try:
-        pos_b1 = df_b.columns.get_loc(b1)
-    except Exception:
-        pos_b1 = None
-    try:
-        pos_b2 = df_b.columns.get_loc(b2)
-    except Exception:
-        pos_b2 = None
+def _build_b_index(df_b, pos_b1, pos_b2):
+    """构建 B 表精确映射与 token 倒排索引
 
-    b_tuples = [tuple(x) for x in df_b.itertuples(index=False, name=None)]
+    B1、B2 两列的去重键统一编号，token 倒排表存为有序 int32 数组（键编号）。
+    """
     b_map1 = defaultdict(list)
     b_map2 = defaultdict(list)
-    token_index1 = defaultdict(set)
-    token_index2 = defaultdict(set)
-    b_key_tokens1 = {}
-    b_key_tokens2 = {}
+    key_ids = {}
+    keys = []
+    key_tokens = []
+    postings = defaultdict(list)
 
-    for idx, row in enumerate(b_tuples):
+    for idx, row in enumerate(df_b.itertuples(index=False, name=None)):
         v1 = _normalize(str(row[pos_b1])) if pos_b1 is not None else ""
         v2 = _normalize(str(row[pos_b2])) if pos_b2 is not None else ""
         if v1:
             b_map1[v1].append(idx)
-            tks = set(_tokens(v1))
-            b_key_tokens1[v1] = tks
-            for t in tks:
-                token_index1[t].add(v1)
         if v2:
             b_map2[v2].append(idx)
-            tks2 = set(_tokens(v2))
-            b_key_tokens2[v2] = tks2
-            for t in tks2:
-                token_index2[t].add(v2)
+        for v in (v1, v2):
+            if v and v not in key_ids:
+                key_ids[v] = len(keys)
+                keys.append(v)
+                tks = set(_tokens(v))
+                key_tokens.append(tks)
+                for t in tks:
+                    postings[t].append(key_ids[v])
+    return {
+        'b_map1': b_map1, 'b_map2': b_map2,
+        'keys': keys, 'key_tokens': key_tokens,
+        'postings': {t: np.array(ids, dtype=np.int32) for t, ids in postings.items()},
+    }
 
-    other_b_cols = [c for c in df_b.columns if c not in {b1, b2}]
-    results = []
-    total = len(df_a)
+def _overlap_counts(lists, n_keys):
+    """各倒排数组拼接后计数，返回 (键编号, 该键在 lists 中出现的次数)"""
+    merged = np.concatenate(lists)
+    if len(merged) > n_keys * BINCOUNT_RATIO:
+        counts = np.bincount(merged, minlength=n_keys)
+        ids = np.flatnonzero(counts).astype(np.int32)
+        return ids, counts[ids]
+    return np.unique(merged, return_counts=True)
+
+def _token_candidates(toks, postings, n_keys, max_cand=MAX_CAND):
+    """按 token 倒排表取候选键编号：全部命中键中与查询 token 重叠数最高的 max_cand 个
+
+    倒排表按长度从短到长排列，前 p 个为稀有 token、其余 rest 个为常见 token（p > rest）：若前 p 个
+    倒排表中已有 max_cand 个键的重叠数大于 rest，只由常见 token 命中的键（重叠数至多为 rest）
+    不可能进入前 max_cand，常见 token 的倒排表只对已有候选做有序查找补足重叠数，不再整表计数；
+    否则对全部倒排表计数。超过 max_cand 时按重叠数做 top-k 部分选择，不再对全部候选排序。
+    """
+    lists = sorted((postings[t] for t in toks if t in postings), key=len)
+    if not lists:
+        return np.empty(0, dtype=np.int32)
+    if len(lists) == 1:
+        return lists[0][:max_cand]
+    ids = None
+    sizes = np.cumsum([len(post) for post in lists])
+    p = len(lists) // 2 + 1
+    rest = len(lists) - p
+    # 重叠数大于 rest 的键必出现在最短的 p - rest 个倒排表之一中；只在常见倒排表占总长大部分时尝试，
+    # 条件不满足时多出的计数开销有上限
+    if rest and sizes[p - rest - 1] >= max_cand and sizes[p - 1] * SKIP_RATIO <= sizes[-1]:
+        head_ids, head_counts = _overlap_counts(lists[:p], n_keys)
+        if np.count_nonzero(head_counts > rest) >= max_cand:
+            ids, counts = head_ids, head_counts
+            for post in lists[p:]:
+                # 倒排数组按键编号有序
+                pos = np.minimum(np.searchsorted(post, ids), len(post) - 1)
+                counts = counts + (post[pos] == ids)
+    if ids is None:
+        ids, counts = _overlap_counts(lists, n_keys)
+    if len(ids) <= max_cand:
+        return ids
+    top = np.argpartition(-counts, max_cand - 1)[:max_cand]
+    return np.sort(ids[top])
 
+def _match_value(a_value, index, b1, b2, threshold_ratio, ranked=None):
+    """单个 A 值匹配：先精确匹配，无结果时按 token 交集模糊匹配
+
+    ranked 为排序模式预先算好的 [(键编号, 得分)]，提供时直接用作模糊匹配结果。
+    返回 [(匹配类型, 来源列, B 行号, 交集率)]
+    """
+    b_map1, b_map2 = index['b_map1'], index['b_map2']
+    keys, key_tokens = index['keys'], index['key_tokens']
+
+    matches = []
+
+    if a_value:
+        if a_value in b_map1:
+            for b_idx in b_map1[a_value]:
+                matches.append(('完全匹配', b1, b_idx, 1.0))
+        if a_value in b_map2:
+            for b_idx in b_map2[a_value]:
+                matches.append(('完全匹配', b2, b_idx, 1.0))
+
+    if not matches and ranked:
+        for key_id, score in ranked:
+            k = keys[key_id]
+            for b_idx in b_map1.get(k, []):
+                matches.append(('模糊匹配', b1, b_idx, score))
+            for b_idx in b_map2.get(k, []):
+                matches.append(('模糊匹配', b2, b_idx, score))
+    elif not matches and a_value and ranked is None:
+        toks = set(_tokens(a_value))
+        for key_id in _token_candidates(toks, index['postings'], len(keys)):
+            k = keys[key_id]
+            tk = key_tokens[key_id]
+            inter = toks & tk
+            ratio = (len(inter) / max(1, min(len(toks), len(tk)))) if (toks and tk) else 0.0
+            if (k in a_value) or (a_value in k) or (len(inter) > 0 and ratio >= threshold_ratio):
+                if k in b_map1:
+                    for b_idx in b_map1.get(k, []):
+                        matches.append(('模糊匹配', b1, b_idx, ratio))
+                if k in b_map2:
+                    for b_idx in b_map2.get(k, []):
+                        matches.append(('模糊匹配', b2, b_idx, ratio))
+    return matches
+
+# ---------- 排序模式（稀疏矩阵批量计算） ----------
+MATCH_MODES = {"token": "token 交集", "ranked": "TF-IDF 排序", "ngram": "字符 n-gram"}
+# 字符 n-gram 模式的 n；基因 ID 去掉标点、统一小写后切分，如 glyma01g000100
+NGRAM_N = 3
+_NON_ALNUM = re.compile(r'[^0-9a-z]+')
+
+def _require_scipy():
     try:
-        pos_a = df_a.columns.get_loc(a_col)
-    except Exception:
-        pos_a = None
+        import scipy.sparse as sp
+    except ImportError:
+        raise ImportError("排序匹配模式需要安装 scipy：pip install scipy")
+    return sp
+
+def _l2_normalize(m):
+    sp = _require_scipy()
+    norms = np.sqrt(np.asarray(m.multiply(m).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sp.diags(1.0 / norms) @ m
+
+def _tfidf_index(index):
+    """由 token 倒排表构建 B 键 × token 的 TF-IDF 稀疏矩阵（行已 L2 归一化）"""
+    sp = _require_scipy()
+    vocab = {t: j for j, t in enumerate(index['postings'])}
+    n_keys = len(index['keys'])
+    lens = np.array([len(p) for p in index['postings'].values()], dtype=np.int64)
+    idf = np.log((1.0 + n_keys) / (1.0 + lens)) + 1.0
+    rows = np.concatenate(list(index['postings'].values())) if vocab else np.empty(0, dtype=np.int32)
+    cols = np.repeat(np.arange(len(vocab)), lens)
+    m = sp.csr_matrix((idf[cols], (rows, cols)), shape=(n_keys, len(vocab)))
+    return vocab, idf, _l2_normalize(m)
+
+def _char_ngrams(s, n=NGRAM_N):
+    """小写并去除非字母数字字符后的字符 n-gram 集合，短于 n 的串整体作为一个 gram"""
+    s = _NON_ALNUM.sub('', s.lower())
+    if len(s) <= n:
+        return {s} if s else set()
+    return {s[i:i + n] for i in range(len(s) - n + 1)}
+
+def _ngram_index(index, n=NGRAM_N):
+    """构建 B 键 × 字符 n-gram 的 0/1 稀疏矩阵（行已 L2 归一化，点积即余弦相似度）"""
+    sp = _require_scipy()
+    vocab, rows, cols = {}, [], []
+    for i, k in enumerate(index['keys']):
+        for g in _char_ngrams(k, n):
+            rows.append(i)
+            cols.append(vocab.setdefault(g, len(vocab)))
+    m = sp.csr_matrix((np.ones(len(rows)), (np.array(rows, dtype=np.int64), np.array(cols, dtype=np.int64))),
+                      shape=(len(index['keys']), len(vocab)))
+    return vocab, np.ones(len(vocab)), _l2_normalize(m)
+
+def _query_matrix(token_sets, vocab, weights):
+    """A 值的 token 集合 -> 与 B 同词表的加权稀疏矩阵（行已 L2 归一化），词表外 token 忽略"""
+    sp = _require_scipy()
+    rows, cols = [], []
+    for i, toks in enumerate(token_sets):
+        for t in toks:
+            j = vocab.get(t)
+            if j is not None:
+                rows.append(i)
+                cols.append(j)
+    cols = np.array(cols, dtype=np.int64)
+    m = sp.csr_matrix((weights[cols], (np.array(rows, dtype=np.int64), cols)),
+                      shape=(len(token_sets), len(vocab)))
+    return _l2_normalize(m)
+
+def _sparse_topn(q, m, top_n, min_score, chunk_size=2000):
+    """分块计算 q·mᵀ 余弦得分，每行保留得分 >= min_score 的前 top_n 个 (列号, 得分)"""
+    mt = m.T.tocsr()
+    out = []
+    for start in range(0, q.shape[0], chunk_size):
+        scores = (q[start:start + chunk_size] @ mt).tocsr()
+        for i in range(scores.shape[0]):
+            lo, hi = scores.indptr[i], scores.indptr[i + 1]
+            data, idx = scores.data[lo:hi], scores.indices[lo:hi]
+            keep = data >= min_score - 1e-9
+            data, idx = data[keep], idx[keep]
+            if len(data) > top_n:
+                top = np.argpartition(-data, top_n - 1)[:top_n]
+                data, idx = data[top], idx[top]
+            order = np.argsort(-data, kind="stable")
+            out.append([(int(idx[j]), round(float(data[j]), 6)) for j in order])
+    return out
+
+def _ranked_scorer(index, mode):
+    """构建排序模式的 B 矩阵，返回 (特征函数, 词表, 权重, B 矩阵, 分块行数)，每次运行只构建一次"""
+    if mode == "ngram":
+        # 常见 gram（如 "gly"）几乎与所有键相交，得分矩阵接近稠密，分块取小以限制内存
+        vocab, weights, m = _ngram_index(index)
+        return _char_ngrams, vocab, weights, m, max(16, 2_000_000 // max(1, len(index['keys'])))
+    vocab, weights, m = _tfidf_index(index)
+    return (lambda v: set(_tokens(v))), vocab, weights, m, 2000
+
+def _ranked_matches(a_values, index, scorer, top_n, min_score):
+    """对所有需模糊匹配的 A 值（非空且无精确匹配）批量计算排序候选，其余行返回 None"""
+    need = [i for i, v in enumerate(a_values) if v and v not in index['b_map1'] and v not in index['b_map2']]
+    result = [None] * len(a_values)
+    if not need or scorer is None:
+        return result
+    featurize, vocab, weights, m, chunk_size = scorer
+    q = _query_matrix([featurize(a_values[i]) for i in need], vocab, weights)
+    for i, cand in zip(need, _sparse_topn(q, m, top_n, min_score, chunk_size)):
+        result[i] = cand
+    return result
+
+# ---------- 多进程并行 ----------
+# 子进程内共享的只读参数 (index, b1, b2, threshold_ratio)，经 initializer 在各子进程中设置一次：
+# fork 启动时 initargs 随进程内存直接继承、无需 pickle；spawn 启动时 pickle 传入。
+# 父进程不写该全局变量，多个窗口同时匹配时各自的进程池互不干扰
+_WORKER_ARGS = None
+
+def _init_worker(args):
+    global _WORKER_ARGS
+    _WORKER_ARGS = args
+
+def _match_chunk(a_values):
+    index, b1, b2, threshold_ratio = _WORKER_ARGS
+    return [_match_value(v, index, b1, b2, threshold_ratio) for v in a_values]
+
+def _match_pool(worker_args, workers):
+    """创建匹配用的进程池；同一次 pro_match 的各块共用该进程池，B 表索引只向子进程传递一次"""
+    ctx = multiprocessing.get_context("fork" if sys.platform.startswith("linux") else "spawn")
+    return ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                               initializer=_init_worker, initargs=(worker_args,))
+
+def _parallel_matches(a_values, executor, workers, chunk_size=None,
+                      progress_cb=None, status_cb=None, stop_flag_getter=None,
+                      offset=0, grand_total=None):
+    """将 A 值分块交给进程池 executor（由 _match_pool 创建）匹配，按原顺序返回每行的匹配列表
+
+    进度与状态回调在主进程中按完成的块汇报（offset/grand_total 为 a_values 在整个 A 表中的
+    起始行与总行数）；stop_flag_getter 返回 True 时取消未开始的块，返回已连续完成的前若干块结果。
+    """
+    total = len(a_values)
+    grand_total = grand_total or total
+    chunk_size = chunk_size or max(200, total // (workers * 8) + 1)
+    chunks = [a_values[i:i + chunk_size] for i in range(0, total, chunk_size)]
+
+    done_chunks = {}
+    stopped = False
+    futures = {executor.submit(_match_chunk, c): i for i, c in enumerate(chunks)}
+    pending = set(futures)
+    done_rows = 0
+    try:
+        while pending:
+            if stop_flag_getter and stop_flag_getter():
+                stopped = True
+                break
+            finished, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+            for f in finished:
+                i = futures[f]
+                done_chunks[i] = f.result()
+                done_rows += len(chunks[i])
+            if finished:
+                if progress_cb:
+                    progress_cb(int((offset + done_rows) / grand_total * 100))
+                if status_cb:
+                    status_cb(f"已处理 {offset + done_rows}/{grand_total} 行")
+    finally:
+        for f in pending:
+            f.cancel()
+
+    if stopped and status_cb:
+        status_cb("任务中止。")
+    all_matches = []
+    for i in range(len(chunks)):
+        if i not in done_chunks:
+            break
+        all_matches.extend(done_chunks[i])
+    return all_matches
 
+def _assemble_results(df_a, df_b, pos_b1, pos_b2, other_b_cols, matches, src_code):
+    """由 df_a 各行的匹配列表按行号一次性取出 A/B 列拼成结果表（列顺序与逐行拼接时一致）
+
+    每个输出行对应 (A 行号, B 行号, 匹配类型, 来源列, 交集率)，B 行号为 -1 表示无匹配；
+    src_code 将来源列名映射为 1 = B1、2 = B2、0 = 无。
+    """
+    out_a, out_b, out_type, out_src, out_ratio = [], [], [], [], []
+    for idx_a, row_matches in enumerate(matches):
+        if row_matches:
+            for mtype, source_col, b_idx, ratio in row_matches:
+                out_a.append(idx_a)
+                out_b.append(b_idx)
+                out_type.append(mtype)
+                out_src.append(src_code.get(source_col, 0))
+                out_ratio.append(round(float(ratio), 3) if ratio is not None else np.nan)
+        else:
+            out_a.append(idx_a)
+            out_b.append(-1)
+            out_type.append('无匹配')
+            out_src.append(0)
+            out_ratio.append(np.nan)
+
+    a_idx = np.asarray(out_a, dtype=np.int64)
+    b_idx = np.asarray(out_b, dtype=np.int64)
+    src = np.asarray(out_src, dtype=np.int8)
+
+    def b_values(pos):
+        # 末尾追加空串，无匹配行的 B 行号 -1 正好取到空串
+        if pos is None:
+            return np.full(len(df_b) + 1, '', dtype=object)
+        return np.append(df_b.iloc[:, pos].to_numpy(dtype=object), '')
+
+    v1 = b_values(pos_b1)[b_idx]
+    v2 = b_values(pos_b2)[b_idx]
+    cols = {c: df_a[c].take(a_idx).to_numpy() for c in df_a.columns}
+    cols['匹配结果'] = np.asarray(out_type, dtype=object)
+    cols['匹配原始值'] = np.where(src == 1, v1, np.where(src == 2, v2, ''))
+    cols['匹配内容'] = np.where(src == 1, v2, np.where(src == 2, v1, ''))
+    cols['交集率'] = np.asarray(out_ratio, dtype=np.float64)
+    for c in other_b_cols:
+        cols[f"B_{c}"] = b_values(df_b.columns.get_loc(c))[b_idx]
+    return pd.DataFrame(cols)
+
+def _match_block(a_values, start, total, index, b1, b2, threshold_ratio, scorer, top_n, workers,
+                 progress_cb=None, status_cb=None, stop_flag_getter=None, executor=None):
+    """匹配 A 表中从 start 行开始的一段值，返回每行的匹配列表；中止时只返回已处理的前若干行
+
+    executor 为 pro_match 创建的进程池，给出时交给子进程并行匹配，否则在当前进程中逐行匹配。
+    """
+    if executor is not None and scorer is None and len(a_values) > 1:
+        return _parallel_matches(a_values, executor, workers,
+                                 progress_cb=progress_cb, status_cb=status_cb,
+                                 stop_flag_getter=stop_flag_getter, offset=start, grand_total=total)
+
+    ranked = _ranked_matches(a_values, index, scorer, top_n, threshold_ratio) if scorer else None
     progress_step = max(1, total // 100)
     status_step = max(1, progress_step * 5)
-
-    for idx_a, tup in enumerate(df_a.itertuples(index=False, name=None)):
+    matches = []
+    for i, a_value in enumerate(a_values):
+        idx_a = start + i
         if stop_flag_getter and stop_flag_getter():
             if status_cb:
                 status_cb("任务中止。")
             break
 
-        a_value_raw = str(tup[pos_a]).strip() if pos_a is not None else ""
-        a_value = _normalize(a_value_raw)
-        a_row_dict = dict(zip(df_a.columns, tup))
-
         if (idx_a + 1) % progress_step == 0 or idx_a == total - 1:
             p = int((idx_a + 1) / total * 100)
             if progress_cb:
                 progress_cb(p)
 
-        matches = []
-
-        if a_value:
-            if a_value in b_map1:
-                for b_idx in b_map1[a_value]:
-                    matches.append(('完全匹配', b1, b_idx, 1.0))
-            if a_value in b_map2:
-                for b_idx in b_map2[a_value]:
-                    matches.append(('完全匹配', b2, b_idx, 1.0))
-
-        if not matches and a_value:
-            toks = set(_tokens(a_value))
-            cand_keys = set()
-            for t in toks:
-                if t in token_index1:
-                    cand_keys.update(token_index1[t])
-                if t in token_index2:
-                    cand_keys.update(token_index2[t])
-
-            MAX_CAND = 500
-            if len(cand_keys) > MAX_CAND:
-                def score_key(k):
-                    tk = b_key_tokens1.get(k) or b_key_tokens2.get(k) or set(_tokens(k))
-                    return -len(toks & tk)
-                cand_keys = set(sorted(cand_keys, key=score_key)[:MAX_CAND])
-
-            for k in cand_keys:
-                if not k:
-                    continue
-                tk = b_key_tokens1.get(k) or b_key_tokens2.get(k) or set(_tokens(k))
-                inter = toks & tk
-                ratio = (len(inter) / max(1, min(len(toks), len(tk)))) if (toks and tk) else 0.0
-                if (k in a_value) or (a_value in k) or (len(inter) > 0 and ratio >= threshold_ratio):
-                    if k in b_map1:
-                        for b_idx in b_map1.get(k, []):
-                            matches.append(('模糊匹配', b1, b_idx, ratio))
-                    if k in b_map2:
-                        for b_idx in b_map2.get(k, []):
-                            matches.append(('模糊匹配', b2, b_idx, ratio))
-
-        if matches:
-            for mtype, source_col, b_idx, ratio in matches:
-                b_row = b_tuples[b_idx]
-                r = a_row_dict.copy()
-                r['匹配结果'] = mtype
-                # 写匹配原始值与匹配内容
-                if source_col == b1 and pos_b1 is not None:
-                    r['匹配原始值'] = b_row[pos_b1]
-                    r['匹配内容'] = b_row[pos_b2] if pos_b2 is not None else ''
-                elif source_col == b2 and pos_b2 is not None:
-                    r['匹配原始值'] = b_row[pos_b2]
-                    r['匹配内容'] = b_row[pos_b1] if pos_b1 is not None else ''
-                else:
-                    r['匹配原始值'] = ''
-                    r['匹配内容'] = ''
-                r['交集率'] = round(float(ratio), 3) if ratio is not None else ''
-                if export_other:
-                    for c in other_b_cols:
-                        try:
-                            pos = cols_b.index(c)
-                            r[f"B_{c}"] = b_row[pos]
-                        except Exception:
-                            r[f"B_{c}"] = ''
-                results.append(r)
-        else:
-            r = a_row_dict.copy()
-            r['匹配结果'] = '无匹配'
-            r['匹配原始值'] = ''
-            r['匹配内容'] = ''
-            r['交集率'] = ''
-            if export_other:
-                for c in other_b_cols:
-                    r[f"B_{c}"] = ''
-            results.append(r)
+        matches.append(_match_value(a_value, index, b1, b2, threshold_ratio,
+                                    ranked[i] if ranked is not None else None))
 
         if (idx_a + 1) % status_step == 0 or idx_a == total - 1:
             if status_cb:
                 status_cb(f"已处理 {idx_a + 1}/{total} 行")
+    return matches
+
+# 检查点目录（位于输出目录下）
+CHECKPOINT_DIR = ".pro_checkpoint"
 
-    if not results:
+def _checkpoint(out_folder, a_path, b_path, a_col, b1, b2, export_other, threshold_ratio, match_mode, top_n):
+    params = {"a_col": a_col, "b1": b1, "b2": b2, "export_other": bool(export_other),
+              "threshold_ratio": float(threshold_ratio), "match_mode": match_mode, "top_n": int(top_n)}
+    return checkpoint_tool.Checkpoint(os.path.join(out_folder, CHECKPOINT_DIR), [a_path, b_path], params)
+
+def checkpoint_progress(out_folder, a_path, b_path, a_col, b1, b2, export_other=True,
+                        threshold_ratio=0.6, match_mode="token", top_n=5):
+    """返回输出目录中与当前输入和参数一致的检查点已完成的 A 行数，无可续跑的检查点时返回 None"""
+    try:
+        state = _checkpoint(out_folder, a_path, b_path, a_col, b1, b2, export_other,
+                            threshold_ratio, match_mode, top_n).state()
+    except OSError:
         return None
+    return state["done"] if state else None
+
+def pro_match(a_path, b_path, out_folder, a_col, b1, b2, export_other=True,
+              threshold_ratio=0.6, progress_cb=None, status_cb=None, stop_flag_getter=None,
+              output_format="xlsx", use_cache=False, workers=1, match_mode="token", top_n=5,
+              stream=False, chunk_size=50000, checkpoint=False, resume=False):
+    """
+    执行匹配并写出结果文件。
+    返回生成的输出文件路径，若无结果或被中断则返回 None。
+    output_format - xlsx / parquet / feather / tsv
+    use_cache - 为 True 时 B 表及其索引按文件内容缓存到本地，B 表未变化时跳过重新解析
+    progress_cb(percent:int) - 可选，接受 0-100
+    status_cb(text:str) - 可选，用于显示状态
+    stop_flag_getter() - 可选，返回 True 则立即中断（安全退出，可能已写部分结果）
+    workers - 大于 1 时将 A 表分块交给多进程并行匹配，结果顺序与单进程一致
+    match_mode - token：token 交集率模糊匹配；ranked：TF-IDF 加权余弦得分排序；
+                 ngram：字符三元组余弦相似度（适合 Glyma.01G000100 / Glyma01g00010 这类 ID）。
+                 后两者每行只保留得分不低于 threshold_ratio 的前 top_n 个 B 键（需要 scipy）
+    stream - 为 True 时 A 表按 chunk_size 行分块匹配，每块结果立即追加写入输出文件
+             （tsv 追加、parquet row group、xlsx constant_memory），内存只保留一块结果；
+             中止时输出文件包含已完成的块且可正常打开
+    checkpoint - 为 True 时每处理 chunk_size 行（及中止时）把已处理行数和部分结果保存到
+                 out_folder/.pro_checkpoint，正常完成后删除
+    resume - 从检查点继续：输入文件或匹配参数与检查点不一致时抛出 ValueError，
+             输出文件包含检查点中已完成的行
+    """
+    output_format = check_format(output_format)
+    ckpt = None
+    begin = 0
+    if checkpoint or resume:
+        ckpt = _checkpoint(out_folder, a_path, b_path, a_col, b1, b2, export_other,
+                           threshold_ratio, match_mode, top_n)
+        if resume:
+            begin = ckpt.resume()
+        else:
+            ckpt.clear()
+    if status_cb:
+        status_cb("读取文件中...")
+    df_a = _read_table(a_path)
+    # 不导出 B 表其他列时只需读取 B1、B2 两列
+    b_usecols = None if export_other else [b1, b2]
+    df_b = cache_tool.cached(b_path, b_usecols, "pro-frame", lambda: _read_table(b_path, usecols=b_usecols),
+                             use_cache=use_cache, set_progress_status=status_cb)
+    if df_a.empty:
+        raise ValueError("A 表为空。")
+
+    if out_folder and not os.path.exists(out_folder):
+        os.makedirs(out_folder, exist_ok=True)
+
+    try:
+        pos_b1 = df_b.columns.get_loc(b1)
+    except Exception:
+        pos_b1 = None
+    try:
+        pos_b2 = df_b.columns.get_loc(b2)
+    except Exception:
+        pos_b2 = None
+
+    index = cache_tool.cached(b_path, [b1, b2], "pro-index-v2",
+                              lambda: _build_b_index(df_b, pos_b1, pos_b2),
+                              use_cache=use_cache, set_progress_status=status_cb)
+    other_b_cols = [c for c in df_b.columns if c not in {b1, b2}] if export_other else []
+    src_code = {b1: 1 if pos_b1 is not None else 0}
+    if b2 not in src_code:
+        src_code[b2] = 2 if pos_b2 is not None else 0
+    total = len(df_a)
+
+    try:
+        pos_a = df_a.columns.get_loc(a_col)
+    except Exception:
+        pos_a = None
+    a_values = ([_normalize(str(v).strip()) for v in df_a.iloc[:, pos_a]] if pos_a is not None
+                else [""] * total)
+
+    if match_mode not in MATCH_MODES:
+        raise ValueError(f"未知的匹配模式: {match_mode}")
+    scorer = None
+    if match_mode != "token" and index['keys']:
+        if status_cb:
+            status_cb(f"{MATCH_MODES[match_mode]}：构建 B 表相似度矩阵...")
+        scorer = _ranked_scorer(index, match_mode)
 
-    df_out = pd.DataFrame(results)
     ts = datetime.now().strftime("%Y%m%d_%H%M%S")
     out_file = os.path.join(out_folder, f"pro_{ts}.xlsx")
-    with pd.ExcelWriter(out_file, engine='xlsxwriter') as writer:
-        df_out.to_excel(writer, index=False, sheet_name='匹配结果')
+    step = max(1, int(chunk_size)) if stream or ckpt else total
+    writer = TableStreamWriter(out_file, output_format, sheet_name='匹配结果') if stream else None
+    parts = []
+    stopped = False
+    # 进程池在整次匹配中只创建一次，分块（流式 / 检查点）时各块复用，避免每块重新启动子进程
+    executor = (_match_pool((index, b1, b2, threshold_ratio), workers)
+                if workers and workers > 1 and scorer is None and total - begin > 1 else None)
+    try:
+        if begin:
+            if status_cb:
+                status_cb(f"从检查点继续：已完成 {begin}/{total} 行")
+            for part in ckpt.parts():
+                if writer is not None:
+                    writer.write(part)
+                else:
+                    parts.append(part)
+        for start in range(begin, total, step):
+            block = a_values[start:start + step]
+            matches = _match_block(block, start, total, index, b1, b2, threshold_ratio, scorer, top_n,
+                                   workers, progress_cb, status_cb, stop_flag_getter, executor)
+            part = _assemble_results(df_a.iloc[start:start + len(matches)], df_b, pos_b1, pos_b2,
+                                     other_b_cols, matches, src_code)
+            if ckpt is not None:
+                ckpt.append(part, start + len(matches))
+            if writer is not None:
+                writer.write(part)
+            else:
+                parts.append(part)
+            if len(matches) < len(block):
+                stopped = True
+                break
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=not stopped, cancel_futures=True)
+        if writer is not None:
+            writer.close()
 
+    if writer is not None:
+        if not writer.rows:
+            return None
+        out_file = writer.path
+    else:
+        df_out = pd.concat(parts, ignore_index=True) if len(parts) > 1 else (parts[0] if parts else None)
+        if df_out is None or df_out.empty:
+            return None
+        if output_format == "xlsx":
+            with pd.ExcelWriter(out_file, engine='xlsxwriter') as xw:
+                df_out.to_excel(xw, index=False, sheet_name='匹配结果')
+        else:
+            out_file = write_table(df_out, out_file, output_format)
+
+    if ckpt is not None:
+        if stopped:
+            if status_cb:
+                status_cb("任务中止，进度已保存到检查点，可稍后继续。")
+            return out_file
+        ckpt.clear()
     if status_cb:
         status_cb("匹配完成。")
     return out_file